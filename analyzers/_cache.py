@@ -0,0 +1,57 @@
+import json
+import time
+from pathlib import Path
+
+# ファンダメンタルデータ用のディスクキャッシュ置き場
+# 価格履歴のpickleキャッシュ（data_fetcher.py）と同じdata/cache配下に置く
+_CACHE_ROOT = Path(__file__).resolve().parent.parent / 'data' / 'cache' / 'fundamental'
+
+
+class FileCache:
+    """
+    JSONファイルベースのTTLキャッシュ
+    data/cache/fundamental/{ticker}/{endpoint}.json に
+    {"ts": 取得時刻(epoch), "data": 本体} の形式で保存する
+    .infoやdividendsのような変化の遅いデータをプロセス再起動をまたいで
+    再利用し、コールドスタート時のネットワーク往復をなくす
+    """
+
+    def __init__(self, root=_CACHE_ROOT):
+        self.root = Path(root)
+
+    def _path(self, ticker, endpoint):
+        safe = str(ticker).replace('/', '-').replace(':', '-')
+        return self.root / safe / f"{endpoint}.json"
+
+    def get(self, ticker, endpoint, ttl):
+        """TTL内のキャッシュがあれば返す（なければNone）"""
+        path = self._path(ticker, endpoint)
+        try:
+            if path.exists():
+                with open(path, encoding='utf-8') as f:
+                    entry = json.load(f)
+                if time.time() - entry.get('ts', 0) < ttl:
+                    return entry.get('data')
+        except Exception as e:
+            print(f"File cache read error for {ticker}/{endpoint}: {e}")
+        return None
+
+    def set(self, ticker, endpoint, data):
+        """キャッシュに書き込む（JSON化できないデータは保存をスキップ）"""
+        path = self._path(ticker, endpoint)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'ts': time.time(), 'data': data}, f, ensure_ascii=False)
+        except Exception as e:
+            print(f"File cache write error for {ticker}/{endpoint}: {e}")
+
+    def get_or_fetch(self, ticker, endpoint, fetch, ttl=86400):
+        """キャッシュヒットなら即返し、ミス時はfetch()して保存してから返す"""
+        cached = self.get(ticker, endpoint, ttl)
+        if cached is not None:
+            return cached
+
+        data = fetch()
+        self.set(ticker, endpoint, data)
+        return data
@@ -1,28 +1,96 @@
 import yfinance as yf
 import pandas as pd
 from datetime import datetime, timedelta
+from pathlib import Path
+
+# yfinance履歴データの2段キャッシュ（メモリ + ディスク）
+# ネットワーク往復（100ms〜数秒）を数msのローカル読み込みに置き換える
+_CACHE_DIR = Path(__file__).resolve().parent.parent / 'data' / 'cache'
+# start/end指定は過去の確定データなので長く持てるが、period指定は末尾が
+# 当日まで伸びる生データ（ポートフォリオの現在価格更新等）なので短いTTLにする
+_CACHE_TTL_SECONDS = 24 * 60 * 60  # 1日（start/end指定）
+_LIVE_CACHE_TTL_SECONDS = 5 * 60   # 5分（period指定）
+_HISTORY_MEMORY_CACHE_MAX = 512
+_history_memory_cache = {}
+
+
+def fetch_history_cached(ticker_symbol, period=None, start=None, end=None):
+    """
+    yf.Ticker.historyの結果をキャッシュ付きで取得
+    キーは (ticker, period, start, end)。同一キーの再取得はメモリ、
+    プロセスをまたぐ場合はdata/cache/のpickleから返す
+    TTLはstart/end指定なら1日、period指定なら5分（現在価格の鮮度を保つ）
+    """
+    cache_key = f"{ticker_symbol}_{period}_{start}_{end}".replace('/', '-').replace(':', '-')
+    ttl = _CACHE_TTL_SECONDS if period is None else _LIVE_CACHE_TTL_SECONDS
+    now = datetime.now().timestamp()
+
+    # 1段目: メモリキャッシュ（取得時刻でTTL判定、期限切れはその場で削除）
+    cached = _history_memory_cache.get(cache_key)
+    if cached is not None:
+        cached_at, hist = cached
+        if now - cached_at < ttl:
+            return hist.copy()
+        del _history_memory_cache[cache_key]
+
+    # 2段目: ディスクキャッシュ（mtimeでTTL判定）
+    cache_file = _CACHE_DIR / f"{cache_key}.pkl"
+    try:
+        if cache_file.exists():
+            mtime = cache_file.stat().st_mtime
+            if now - mtime < ttl:
+                hist = pd.read_pickle(cache_file)
+                if len(_history_memory_cache) >= _HISTORY_MEMORY_CACHE_MAX:
+                    _history_memory_cache.pop(next(iter(_history_memory_cache)))
+                _history_memory_cache[cache_key] = (mtime, hist)
+                return hist.copy()
+    except Exception as e:
+        print(f"History cache read error for {ticker_symbol}: {e}")
+
+    # キャッシュミス: ネットワーク取得
+    stock = yf.Ticker(ticker_symbol)
+    if period is not None:
+        hist = stock.history(period=period)
+    else:
+        hist = stock.history(start=start, end=end)
+
+    if not hist.empty:
+        if len(_history_memory_cache) >= _HISTORY_MEMORY_CACHE_MAX:
+            _history_memory_cache.pop(next(iter(_history_memory_cache)))
+        _history_memory_cache[cache_key] = (now, hist)
+        try:
+            _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            hist.to_pickle(cache_file)
+        except Exception as e:
+            print(f"History cache write error for {ticker_symbol}: {e}")
+
+    return hist.copy()
+
 
 class StockDataFetcher:
+    def _resolve_symbol(self, ticker):
+        """日本株（4桁数字）の場合、.Tサフィックスを自動追加"""
+        if ticker.isdigit() and len(ticker) == 4:
+            return f"{ticker}.T"
+        return ticker
+
     def fetch_stock_data(self, ticker, period='6mo'):
         """
-        yfinanceから株価データを取得
+        yfinanceから株価データを取得（メタ情報込み、.infoの取得コストがかかる）
+        価格だけでよい場合はfetch_dataを使うこと（.infoの追加スクレイプを省ける）
         ticker: 銘柄コード（例: '7203' or '7203.T' for トヨタ）
         period: 期間（1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max）
         """
-        # 日本株の場合、.Tサフィックスを自動追加
-        if ticker.isdigit() and len(ticker) == 4:
-            ticker_symbol = f"{ticker}.T"
-        else:
-            ticker_symbol = ticker
-            
+        ticker_symbol = self._resolve_symbol(ticker)
+
         try:
             stock = yf.Ticker(ticker_symbol)
-            
+
             # 基本情報取得
             info = stock.info
-            
-            # 価格データ取得
-            hist = stock.history(period=period)
+
+            # 価格データ取得（キャッシュ付き）
+            hist = fetch_history_cached(ticker_symbol, period=period)
             
             if hist.empty:
                 raise ValueError(f"No data available for {ticker_symbol}")
@@ -31,7 +99,9 @@ class StockDataFetcher:
             return {
                 'ticker': ticker,
                 'company_name': info.get('longName', ticker),
-                'prices': hist[['Open', 'High', 'Low', 'Close', 'Volume']].to_dict('records'),
+                # 列指向のNumPy配列で渡すと受け側がcopy=Falseでゼロコピー構築できる
+                'prices': {col: hist[col].to_numpy()
+                           for col in ('Open', 'High', 'Low', 'Close', 'Volume')},
                 'dates': hist.index.strftime('%Y-%m-%d').tolist(),
                 'current_price': hist['Close'].iloc[-1],
                 'market_cap': info.get('marketCap', 0),
@@ -43,20 +113,55 @@ class StockDataFetcher:
             print(f"fetch_stock_data error for {ticker}: {e}")
             raise e
     
+    def fetch_many(self, tickers, start=None, end=None, period='6mo'):
+        """
+        複数銘柄の価格データを一括取得（銘柄コード -> DataFrame の辞書を返す）
+        銘柄ごとにTicker.historyを直列で呼ぶ代わりにyf.downloadの並列HTTPを使い、
+        銘柄数にほぼ比例した高速化を得る
+        """
+        symbol_map = {self._resolve_symbol(ticker): ticker for ticker in tickers}
+
+        symbols = list(symbol_map.keys())
+        if not symbols:
+            return {}
+
+        try:
+            if start is not None:
+                wide = yf.download(symbols, start=start, end=end, group_by='ticker',
+                                   threads=True, progress=False, auto_adjust=False)
+            else:
+                wide = yf.download(symbols, period=period, group_by='ticker',
+                                   threads=True, progress=False, auto_adjust=False)
+        except Exception as e:
+            print(f"fetch_many error for {tickers}: {e}")
+            return {}
+
+        if wide.empty:
+            return {}
+
+        result = {}
+        if len(symbols) == 1:
+            # 単一銘柄の場合はMultiIndexにならない
+            result[symbol_map[symbols[0]]] = wide.dropna(how='all')
+        else:
+            for symbol, ticker in symbol_map.items():
+                if symbol in wide.columns.get_level_values(0):
+                    hist = wide[symbol].dropna(how='all')
+                    if not hist.empty:
+                        result[ticker] = hist
+
+        return result
+
     def fetch_data(self, ticker, period='6mo'):
         """
         スイング分析用のデータ取得（pandas DataFrameで返す）
+        価格のみが必要なパスなので.infoには触れない
         """
-        # 日本株の場合、.Tサフィックスを自動追加
-        if ticker.isdigit() and len(ticker) == 4:
-            ticker_symbol = f"{ticker}.T"
-        else:
-            ticker_symbol = ticker
-        
+        ticker_symbol = self._resolve_symbol(ticker)
+
         try:
-            stock = yf.Ticker(ticker_symbol)
-            hist = stock.history(period=period)
-            
+            hist = fetch_history_cached(ticker_symbol, period=period)
+
             if hist.empty:
                 return None
                 
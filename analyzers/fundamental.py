@@ -2,6 +2,52 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from functools import lru_cache
+import concurrent.futures
+from analyzers._cache import FileCache
+
+# ディスクキャッシュ（プロセス再起動後もTTL内なら再利用）
+_file_cache = FileCache()
+_INFO_TTL_SECONDS = 24 * 60 * 60        # .infoは1日
+_DIVIDENDS_TTL_SECONDS = 7 * 24 * 60 * 60  # 配当履歴は7日
+
+
+@lru_cache(maxsize=128)
+def _ticker(symbol):
+    """yf.Tickerオブジェクトをプロセス内で使い回す"""
+    return yf.Ticker(symbol)
+
+
+@lru_cache(maxsize=128)
+def _ticker_info(symbol):
+    """
+    .infoの取得結果をメモ化（メモリ + ディスクの2段）
+    .infoはHTTP往復を伴う重いプロパティで、総合分析では複数メソッドが
+    同じ銘柄のinfoを参照するため、1銘柄1回の取得に抑える
+    """
+    return _file_cache.get_or_fetch(
+        symbol, 'info',
+        lambda: _ticker(symbol).info,
+        ttl=_INFO_TTL_SECONDS)
+
+
+@lru_cache(maxsize=128)
+def _ticker_dividends(symbol):
+    """
+    配当履歴をメモ化（メモリ + ディスクの2段）
+    JSON保存のため日付文字列の辞書で永続化し、Seriesに復元して返す
+    """
+    raw = _file_cache.get_or_fetch(
+        symbol, 'dividends',
+        lambda: {ts.isoformat(): float(v)
+                 for ts, v in _ticker(symbol).dividends.items()},
+        ttl=_DIVIDENDS_TTL_SECONDS)
+    if not raw:
+        return pd.Series(dtype=float)
+    series = pd.Series(raw)
+    series.index = pd.to_datetime(series.index)
+    return series
+
 
 class FundamentalAnalyzer:
     """
@@ -9,6 +55,10 @@ class FundamentalAnalyzer:
     PER/PBR比較、適正株価計算、配当利回り分析、財務指標分析を提供
     """
     
+    # comprehensive_analysis結果のTTLキャッシュ設定
+    _RESULT_CACHE_TTL_SECONDS = 300
+    _RESULT_CACHE_MAX = 256
+
     def __init__(self):
         # 日本市場の平均的な指標（参考値）
         self.market_averages = {
@@ -17,15 +67,27 @@ class FundamentalAnalyzer:
             'roe': 8.0,   # 日本企業平均ROE
             'dividend_yield': 2.0  # 日本株平均配当利回り
         }
+        # (ticker, 主要入力値) -> (取得時刻, 結果) の簡易TTLキャッシュ
+        # 同一セッション内の再分析（チャート更新等）を辞書参照1回にする
+        self._result_cache = {}
     
+    def _as_pct(self, value):
+        """小数の比率を％に変換（0や欠損は0のまま）"""
+        return value * 100.0 if value else 0.0
+
     def _safe_float(self, value, default=0.0):
-        """安全なfloat変換（NaN対応）"""
+        """安全なfloat変換（NaN対応）
+        pd.isnaの型ディスパッチを避け、float化とf != f（NaNはNaN比較でFalseに
+        ならない唯一の値）だけで判定する。1回の分析で20回以上呼ばれるため
+        スカラー変換のオーバーヘッドを最小にしている
+        """
+        if value is None:
+            return default
         try:
-            if value is None or pd.isna(value) or np.isnan(float(value)):
-                return default
-            return float(value)
+            f = float(value)
         except (TypeError, ValueError):
             return default
+        return default if f != f else f
     
     def analyze_valuation(self, stock_data):
         """
@@ -65,55 +127,67 @@ class FundamentalAnalyzer:
                 'overall_rating': 'データなし'
             }
     
-    def calculate_fair_value(self, ticker, stock_data):
+    def calculate_fair_value(self, ticker, stock_data, info=None):
         """
         適正株価計算（複数手法）
+        infoを渡せば.infoの再取得を省ける（comprehensive_analysisから共有）
         """
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            
+            if info is None:
+                info = _ticker_info(ticker)
+
             # 財務データ取得
             eps = self._safe_float(info.get('trailingEps'))
             book_value_per_share = self._safe_float(info.get('bookValue'))
             roe = self._safe_float(info.get('returnOnEquity'))
             dividend_per_share = self._safe_float(info.get('dividendRate'))
             
-            fair_values = {}
-            
+            # 各手法の適正株価を並べて最後にまとめてベクトル演算する
+            methods = []
+            values = []
+
             # 1. PERベース適正株価
             if eps > 0:
-                fair_values['per_based'] = eps * self.market_averages['per']
-            
+                methods.append('per_based')
+                values.append(eps * self.market_averages['per'])
+
             # 2. PBRベース適正株価
             if book_value_per_share > 0:
-                fair_values['pbr_based'] = book_value_per_share * self.market_averages['pbr']
-            
+                methods.append('pbr_based')
+                values.append(book_value_per_share * self.market_averages['pbr'])
+
             # 3. 配当割引モデル（簡易版）
             if dividend_per_share > 0:
                 # 成長率を5%と仮定、要求リターンを8%と仮定
                 growth_rate = 0.05
                 required_return = 0.08
                 if required_return > growth_rate:
-                    fair_values['dividend_discount'] = dividend_per_share * (1 + growth_rate) / (required_return - growth_rate)
-            
+                    methods.append('dividend_discount')
+                    values.append(dividend_per_share * (1 + growth_rate) / (required_return - growth_rate))
+
             # 4. ROEベース適正株価（Graham formula簡易版）
             if eps > 0 and roe > 0:
-                fair_values['roe_based'] = eps * (8.5 + 2 * min(roe * 100, 15))
-            
-            # 平均適正株価
-            if fair_values:
-                fair_values['average'] = sum(fair_values.values()) / len(fair_values)
-            
+                methods.append('roe_based')
+                values.append(eps * (8.5 + 2 * min(roe * 100, 15)))
+
+            # 平均適正株価（構築済み配列のC実装reductionで求める）
+            arr = np.array(values)
+            if len(arr):
+                methods.append('average')
+                arr = np.append(arr, arr.mean())
+
+            fair_values = dict(zip(methods, arr.tolist()))
+
             current_price = self._safe_float(stock_data.get('current_price'))
-            
-            # 現在価格との比較
+
+            # 現在価格との比較（各手法の値は正なので一括で割れる）
             price_comparison = {}
-            if current_price > 0:
-                for method, fair_price in fair_values.items():
-                    if fair_price > 0:
-                        price_comparison[f'{method}_ratio'] = current_price / fair_price
-                        price_comparison[f'{method}_upside'] = ((fair_price - current_price) / current_price) * 100
+            if current_price > 0 and len(arr):
+                ratios = current_price / arr
+                upsides = (arr - current_price) / current_price * 100.0
+                for method, ratio, upside in zip(methods, ratios.tolist(), upsides.tolist()):
+                    price_comparison[f'{method}_ratio'] = ratio
+                    price_comparison[f'{method}_upside'] = upside
             
             return {
                 'fair_values': fair_values,
@@ -121,7 +195,7 @@ class FundamentalAnalyzer:
                 'price_comparison': price_comparison,
                 'eps': eps,
                 'book_value_per_share': book_value_per_share,
-                'roe': roe * 100 if roe else 0,
+                'roe': self._as_pct(roe),
                 'dividend_per_share': dividend_per_share
             }
             
@@ -132,14 +206,15 @@ class FundamentalAnalyzer:
                 'price_comparison': {}
             }
     
-    def analyze_dividend(self, ticker, stock_data):
+    def analyze_dividend(self, ticker, stock_data, info=None):
         """
         配当利回り分析
+        infoを渡せば.infoの再取得を省ける（comprehensive_analysisから共有）
         """
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            
+            if info is None:
+                info = _ticker_info(ticker)
+
             dividend_yield = self._safe_float(stock_data.get('dividend_yield'))
             dividend_rate = self._safe_float(info.get('dividendRate'))
             payout_ratio = self._safe_float(info.get('payoutRatio'))
@@ -152,10 +227,10 @@ class FundamentalAnalyzer:
             
             # 配当履歴取得（過去5年）
             try:
-                dividends = stock.dividends
+                dividends = _ticker_dividends(ticker)
                 if not dividends.empty:
-                    # 年次配当推移
-                    yearly_dividends = dividends.resample('Y').sum()
+                    # 年次配当推移（resampleの期間インデックス構築を避け、年の整数でまとめる）
+                    yearly_dividends = dividends.groupby(dividends.index.year).sum()
                     dividend_growth = self._calculate_dividend_growth(yearly_dividends)
                 else:
                     dividend_growth = None
@@ -163,9 +238,9 @@ class FundamentalAnalyzer:
                 dividend_growth = None
             
             return {
-                'dividend_yield': dividend_yield * 100 if dividend_yield else 0,
+                'dividend_yield': self._as_pct(dividend_yield),
                 'dividend_rate': dividend_rate,
-                'payout_ratio': payout_ratio * 100 if payout_ratio else 0,
+                'payout_ratio': self._as_pct(payout_ratio),
                 'yield_vs_market': (dividend_yield - self.market_averages['dividend_yield'] / 100) * 100 if dividend_yield else None,
                 'yield_rating': yield_rating,
                 'payout_rating': payout_rating,
@@ -179,39 +254,41 @@ class FundamentalAnalyzer:
                 'yield_rating': 'データなし'
             }
     
-    def analyze_financial_health(self, ticker):
+    # analyze_financial_healthで参照するinfoフィールドの対応表
+    _FINANCIAL_INFO_KEYS = (
+        ('debtToEquity', 'debt_to_equity'),
+        ('currentRatio', 'current_ratio'),
+        ('quickRatio', 'quick_ratio'),
+        ('operatingMargins', 'operating_margin'),
+        ('profitMargins', 'profit_margin'),
+        ('returnOnEquity', 'roe'),
+        ('returnOnAssets', 'roa'),
+    )
+
+    def analyze_financial_health(self, ticker, info=None):
         """
         財務健全性分析
+        infoを渡せば.infoの再取得を省ける（comprehensive_analysisから共有）
         """
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            
-            # 主要財務指標
-            debt_to_equity = self._safe_float(info.get('debtToEquity'))
-            current_ratio = self._safe_float(info.get('currentRatio'))
-            quick_ratio = self._safe_float(info.get('quickRatio'))
-            operating_margin = self._safe_float(info.get('operatingMargins'))
-            profit_margin = self._safe_float(info.get('profitMargins'))
-            roe = self._safe_float(info.get('returnOnEquity'))
-            roa = self._safe_float(info.get('returnOnAssets'))
-            
-            # 健全性評価
-            financial_score = self._calculate_financial_score({
-                'debt_to_equity': debt_to_equity,
-                'current_ratio': current_ratio,
-                'operating_margin': operating_margin,
-                'roe': roe
-            })
-            
+            if info is None:
+                info = _ticker_info(ticker)
+
+            # 主要財務指標を1パスで抽出（info側キー -> 出力キーの対応表）
+            metrics = {out_key: self._safe_float(info.get(info_key))
+                       for info_key, out_key in self._FINANCIAL_INFO_KEYS}
+
+            # 健全性評価（スコアは負債比率・流動比率・営業利益率・ROEの4指標）
+            financial_score = self._calculate_financial_score(metrics)
+
             return {
-                'debt_to_equity': debt_to_equity,
-                'current_ratio': current_ratio,
-                'quick_ratio': quick_ratio,
-                'operating_margin': operating_margin * 100 if operating_margin else 0,
-                'profit_margin': profit_margin * 100 if profit_margin else 0,
-                'roe': roe * 100 if roe else 0,
-                'roa': roa * 100 if roa else 0,
+                'debt_to_equity': metrics['debt_to_equity'],
+                'current_ratio': metrics['current_ratio'],
+                'quick_ratio': metrics['quick_ratio'],
+                'operating_margin': self._as_pct(metrics['operating_margin']),
+                'profit_margin': self._as_pct(metrics['profit_margin']),
+                'roe': self._as_pct(metrics['roe']),
+                'roa': self._as_pct(metrics['roa']),
                 'financial_score': financial_score,
                 'financial_rating': self._rate_financial_score(financial_score)
             }
@@ -227,12 +304,32 @@ class FundamentalAnalyzer:
         """
         総合ファンダメンタル分析
         """
+        # 同一入力の再分析はTTL内ならキャッシュ結果をそのまま返す
+        cache_key = (ticker, tuple(sorted(
+            (k, stock_data.get(k))
+            for k in ('per', 'pbr', 'current_price', 'market_cap', 'dividend_yield'))))
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            ts, result = cached
+            if datetime.now().timestamp() - ts < self._RESULT_CACHE_TTL_SECONDS:
+                return result
+            del self._result_cache[cache_key]
+
         try:
-            # 各分析を実行
-            valuation = self.analyze_valuation(stock_data)
-            fair_value = self.calculate_fair_value(ticker, stock_data)
-            dividend = self.analyze_dividend(ticker, stock_data)
-            financial = self.analyze_financial_health(ticker)
+            # .infoは1回だけ取得し、各分析に共有する
+            info = _ticker_info(ticker)
+
+            # 各分析を並列実行（配当履歴取得などのI/O待ちを重ねる）
+            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as ex:
+                f_valuation = ex.submit(self.analyze_valuation, stock_data)
+                f_fair_value = ex.submit(self.calculate_fair_value, ticker, stock_data, info)
+                f_dividend = ex.submit(self.analyze_dividend, ticker, stock_data, info)
+                f_financial = ex.submit(self.analyze_financial_health, ticker, info)
+
+                valuation = f_valuation.result()
+                fair_value = f_fair_value.result()
+                dividend = f_dividend.result()
+                financial = f_financial.result()
             
             # 総合スコア計算
             total_score = self._calculate_total_score(valuation, dividend, financial)
@@ -249,7 +346,7 @@ class FundamentalAnalyzer:
                 'opportunities': investment_advice.get('opportunities', [])
             }
             
-            return {
+            result = {
                 'valuation': valuation,
                 'fair_value': fair_value,
                 'dividend': dividend,
@@ -259,7 +356,14 @@ class FundamentalAnalyzer:
                 'overall_assessment': overall_assessment,  # フロントエンド用
                 'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             }
-            
+
+            if len(self._result_cache) >= self._RESULT_CACHE_MAX:
+                self._result_cache.pop(next(iter(self._result_cache)))
+            self._result_cache[cache_key] = (datetime.now().timestamp(), result)
+
+            return result
+
+
         except Exception as e:
             return {
                 'error': f'総合分析エラー: {str(e)}',
@@ -273,82 +377,145 @@ class FundamentalAnalyzer:
                 'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             }
 
+    # 日本語推奨 → 英語形式の変換表（フロントエンド互換性のため）
+    _RECO_MAP = {
+        '買い推奨': 'buy',
+        'やや買い': 'buy',
+        '中立': 'hold',
+        '保有継続': 'hold',
+        'やや売り': 'sell',
+        '売り推奨': 'sell'
+    }
+
+    def batch_analyze(self, tickers, max_workers=16):
+        """
+        複数銘柄の一括ファンダメンタル評価（スクリーナー/ポートフォリオ用途）
+        infoの取得だけ並列I/Oで行い、評価・スコア計算は全銘柄まとめて
+        numpy配列で処理する（銘柄ループなし）
+        結果は銘柄コードをインデックスとするDataFrameで返す
+        """
+        if not tickers:
+            return pd.DataFrame()
+
+        def fetch_info_safe(ticker):
+            try:
+                return _ticker_info(ticker) or {}
+            except Exception as e:
+                print(f"batch_analyze info fetch error for {ticker}: {e}")
+                return {}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
+            infos = list(ex.map(fetch_info_safe, tickers))
+
+        df = pd.DataFrame({
+            'per': [self._safe_float(i.get('trailingPE')) for i in infos],
+            'pbr': [self._safe_float(i.get('priceToBook')) for i in infos],
+            'debt_to_equity': [self._safe_float(i.get('debtToEquity')) for i in infos],
+            'current_ratio': [self._safe_float(i.get('currentRatio')) for i in infos],
+            'operating_margin': [self._safe_float(i.get('operatingMargins')) for i in infos],
+            'roe': [self._safe_float(i.get('returnOnEquity')) for i in infos],
+            'dividend_yield': [self._safe_float(i.get('dividendYield')) for i in infos],
+            'eps': [self._safe_float(i.get('trailingEps')) for i in infos],
+            'book_value': [self._safe_float(i.get('bookValue')) for i in infos],
+        }, index=pd.Index(tickers, name='ticker'))
+
+        # 評価ラベル（スカラー版と同じビン表を列ごと一括で引く）
+        per = df['per'].to_numpy()
+        pbr = df['pbr'].to_numpy()
+        per_rating = np.where(per > 0,
+                              self._PER_LABELS[np.searchsorted(self._PER_BINS, per, side='right')],
+                              'データなし')
+        pbr_rating = np.where(pbr > 0,
+                              self._PBR_LABELS[np.searchsorted(self._PBR_BINS, pbr, side='right')],
+                              'データなし')
+
+        # 総合バリュエーション評価（_calculate_overall_ratingと同じ優先順位）
+        has_cheap = (per_rating == '割安') | (pbr_rating == '割安')
+        has_mild_cheap = (per_rating == 'やや割安') | (pbr_rating == 'やや割安')
+        has_rich = (per_rating == '割高') | (pbr_rating == '割高')
+        has_mild_rich = (per_rating == 'やや割高') | (pbr_rating == 'やや割高')
+        overall_rating = np.select(
+            [has_cheap, has_mild_cheap & ~has_rich, has_rich, has_mild_rich],
+            ['割安', 'やや割安', '割高', 'やや割高'], default='適正')
+
+        # 配当利回り評価（％/小数の正規化もベクトルで）
+        dy = df['dividend_yield'].to_numpy()
+        dy_annual = np.where(dy < 1, dy * 100, dy)
+        yield_rating = np.where(dy > 0,
+                                self._YIELD_LABELS[np.searchsorted(self._YIELD_BINS, dy_annual, side='right')],
+                                'データなし')
+
+        # 財務健全性スコア（4指標 × searchsorted）
+        financial_score = np.zeros(len(df))
+        for name, (thresh, points, side) in self._FINANCIAL_SCORE_TABLES.items():
+            financial_score += points[np.searchsorted(thresh, df[name].to_numpy(), side=side)]
+
+        # 適正株価（PER/PBRベースのみ、eps・BPSがない銘柄はNaN）
+        eps = df['eps'].to_numpy()
+        bps = df['book_value'].to_numpy()
+        fair_per = np.where(eps > 0, eps * self.market_averages['per'], np.nan)
+        fair_pbr = np.where(bps > 0, bps * self.market_averages['pbr'], np.nan)
+
+        # 総合スコア（_calculate_total_scoreと同じ配点）
+        valuation_points = pd.Series(overall_rating).map(self._VALUATION_SCORES).fillna(5).to_numpy()
+        yield_points = pd.Series(yield_rating).map(self._YIELD_SCORES).fillna(10).to_numpy()
+        total_score = np.minimum(100, np.round(valuation_points + yield_points + financial_score * 0.45))
+
+        result = df.copy()
+        result['per_rating'] = per_rating
+        result['pbr_rating'] = pbr_rating
+        result['overall_rating'] = overall_rating
+        result['yield_rating'] = yield_rating
+        result['financial_score'] = financial_score.astype(int)
+        result['fair_value_per'] = fair_per
+        result['fair_value_pbr'] = fair_pbr
+        result['total_score'] = total_score.astype(int)
+        return result
+
     def _convert_recommendation_to_english(self, japanese_recommendation):
         """日本語推奨を英語形式に変換（フロントエンド互換性のため）"""
-        conversion_map = {
-            '買い推奨': 'buy',
-            'やや買い': 'buy',
-            '中立': 'hold',
-            '保有継続': 'hold', 
-            'やや売り': 'sell',
-            '売り推奨': 'sell'
-        }
-        return conversion_map.get(japanese_recommendation, 'hold')
+        return self._RECO_MAP.get(japanese_recommendation, 'hold')
     
     # 評価ヘルパーメソッド
+    # 各指標のビン（しきい値昇順）とラベル。searchsorted(side='right')で
+    # 「しきい値未満」の区間判定になり、if/elif連鎖と同じ結果を返す
+    # バッチ評価（将来のスクリーナー用途）にもそのまま使える
+    _PER_BINS = np.array([10, 15, 20, 30])
+    _PER_LABELS = np.array(['割安', 'やや割安', '適正', 'やや割高', '割高'])
+    _PBR_BINS = np.array([0.8, 1.0, 1.5, 2.0])
+    _PBR_LABELS = np.array(['割安', 'やや割安', '適正', 'やや割高', '割高'])
+    _YIELD_BINS = np.array([1, 2, 4, 6])
+    _YIELD_LABELS = np.array(['低い', 'やや低い', '適正', '高い', '非常に高い'])
+    _PAYOUT_BINS = np.array([30, 50, 70])
+    _PAYOUT_LABELS = np.array(['保守的', '適正', 'やや高い', '高い'])
+
     def _rate_per(self, per):
         """PER評価"""
         if per <= 0:
             return 'データなし'
-        elif per < 10:
-            return '割安'
-        elif per < 15:
-            return 'やや割安'
-        elif per < 20:
-            return '適正'
-        elif per < 30:
-            return 'やや割高'
-        else:
-            return '割高'
-    
+        return str(self._PER_LABELS[np.searchsorted(self._PER_BINS, per, side='right')])
+
     def _rate_pbr(self, pbr):
         """PBR評価"""
         if pbr <= 0:
             return 'データなし'
-        elif pbr < 0.8:
-            return '割安'
-        elif pbr < 1.0:
-            return 'やや割安'
-        elif pbr < 1.5:
-            return '適正'
-        elif pbr < 2.0:
-            return 'やや割高'
-        else:
-            return '割高'
-    
+        return str(self._PBR_LABELS[np.searchsorted(self._PBR_BINS, pbr, side='right')])
+
     def _rate_dividend_yield(self, yield_pct):
         """配当利回り評価"""
         if not yield_pct or yield_pct <= 0:
             return 'データなし'
-        
+
         yield_annual = yield_pct * 100 if yield_pct < 1 else yield_pct
-        
-        if yield_annual < 1:
-            return '低い'
-        elif yield_annual < 2:
-            return 'やや低い'
-        elif yield_annual < 4:
-            return '適正'
-        elif yield_annual < 6:
-            return '高い'
-        else:
-            return '非常に高い'
-    
+        return str(self._YIELD_LABELS[np.searchsorted(self._YIELD_BINS, yield_annual, side='right')])
+
     def _rate_payout_ratio(self, payout):
         """配当性向評価"""
         if not payout or payout <= 0:
             return 'データなし'
-        
+
         payout_pct = payout * 100 if payout < 1 else payout
-        
-        if payout_pct < 30:
-            return '保守的'
-        elif payout_pct < 50:
-            return '適正'
-        elif payout_pct < 70:
-            return 'やや高い'
-        else:
-            return '高い'
+        return str(self._PAYOUT_LABELS[np.searchsorted(self._PAYOUT_BINS, payout_pct, side='right')])
     
     def _calculate_overall_rating(self, per_rating, pbr_rating):
         """総合バリュエーション評価"""
@@ -365,83 +532,49 @@ class FundamentalAnalyzer:
             return '適正'
     
     def _calculate_dividend_growth(self, yearly_dividends):
-        """配当成長率計算"""
-        if len(yearly_dividends) < 2:
-            return None
-        
+        """配当成長率計算（過去5年の年平均成長率）
+        端点2つしか使わないのでSeriesを経由せずnumpy配列で直接参照する
+        """
         try:
-            # 過去5年の平均成長率
-            years = min(5, len(yearly_dividends))
-            recent_dividends = yearly_dividends[-years:]
-            
-            if len(recent_dividends) >= 2:
-                first_year = recent_dividends.iloc[0]
-                last_year = recent_dividends.iloc[-1]
-                
-                if first_year > 0:
-                    growth_rate = ((last_year / first_year) ** (1 / (years - 1)) - 1) * 100
-                    return round(growth_rate, 2)
-            
+            arr = np.asarray(yearly_dividends)
+            n = arr.size
+            if n < 2:
+                return None
+
+            years = min(5, n)
+            first_year = arr[-years]
+            last_year = arr[-1]
+
+            if first_year > 0:
+                growth_rate = ((last_year / first_year) ** (1 / (years - 1)) - 1) * 100
+                return round(float(growth_rate), 2)
+
             return None
         except:
             return None
     
+    # 財務健全性スコアの採点テーブル（各25点満点）
+    # (しきい値昇順, 配点, searchsortedのside) — 負債比率は「以下で高得点」
+    # なのでside='left'、他は「以上で高得点」なのでside='right'
+    _FINANCIAL_SCORE_TABLES = {
+        'debt_to_equity': (np.array([0.3, 0.5, 1.0, 2.0]),
+                           np.array([25, 20, 15, 10, 5]), 'left'),
+        'current_ratio': (np.array([1.0, 1.2, 1.5, 2.0]),
+                          np.array([5, 10, 15, 20, 25]), 'right'),
+        'operating_margin': (np.array([0.02, 0.05, 0.10, 0.15]),
+                             np.array([5, 10, 15, 20, 25]), 'right'),
+        'roe': (np.array([0.05, 0.08, 0.10, 0.15]),
+                np.array([5, 10, 15, 20, 25]), 'right'),
+    }
+
     def _calculate_financial_score(self, metrics):
-        """財務健全性スコア計算（0-100）"""
+        """財務健全性スコア計算（0-100）
+        if/elif連鎖の代わりに採点テーブルをsearchsortedで引く
+        """
         score = 0
-        
-        # 負債比率評価（25点満点）
-        debt_to_equity = metrics.get('debt_to_equity', 0)
-        if debt_to_equity <= 0.3:
-            score += 25
-        elif debt_to_equity <= 0.5:
-            score += 20
-        elif debt_to_equity <= 1.0:
-            score += 15
-        elif debt_to_equity <= 2.0:
-            score += 10
-        else:
-            score += 5
-        
-        # 流動比率評価（25点満点）
-        current_ratio = metrics.get('current_ratio', 0)
-        if current_ratio >= 2.0:
-            score += 25
-        elif current_ratio >= 1.5:
-            score += 20
-        elif current_ratio >= 1.2:
-            score += 15
-        elif current_ratio >= 1.0:
-            score += 10
-        else:
-            score += 5
-        
-        # 営業利益率評価（25点満点）
-        operating_margin = metrics.get('operating_margin', 0)
-        if operating_margin >= 0.15:
-            score += 25
-        elif operating_margin >= 0.10:
-            score += 20
-        elif operating_margin >= 0.05:
-            score += 15
-        elif operating_margin >= 0.02:
-            score += 10
-        else:
-            score += 5
-        
-        # ROE評価（25点満点）
-        roe = metrics.get('roe', 0)
-        if roe >= 0.15:
-            score += 25
-        elif roe >= 0.10:
-            score += 20
-        elif roe >= 0.08:
-            score += 15
-        elif roe >= 0.05:
-            score += 10
-        else:
-            score += 5
-        
+        for name, (thresh, points, side) in self._FINANCIAL_SCORE_TABLES.items():
+            value = metrics.get(name, 0)
+            score += int(points[np.searchsorted(thresh, value, side=side)])
         return score
     
     def _rate_financial_score(self, score):
@@ -457,36 +590,16 @@ class FundamentalAnalyzer:
         else:
             return '危険'
     
+    # 総合スコアの配点表（評価ラベル → 点数、該当なしはデフォルト値）
+    _VALUATION_SCORES = {'割安': 30, 'やや割安': 20, '適正': 15, 'やや割高': 10}
+    _YIELD_SCORES = {'高い': 25, '適正': 25, 'やや低い': 15}
+
     def _calculate_total_score(self, valuation, dividend, financial):
         """総合スコア計算"""
-        score = 0
-        
-        # バリュエーションスコア
-        overall_rating = valuation.get('overall_rating', '')
-        if overall_rating == '割安':
-            score += 30
-        elif overall_rating == 'やや割安':
-            score += 20
-        elif overall_rating == '適正':
-            score += 15
-        elif overall_rating == 'やや割高':
-            score += 10
-        else:
-            score += 5
-        
-        # 配当スコア
-        yield_rating = dividend.get('yield_rating', '')
-        if yield_rating in ['高い', '適正']:
-            score += 25
-        elif yield_rating == 'やや低い':
-            score += 15
-        else:
-            score += 10
-        
-        # 財務スコア
-        financial_score = financial.get('financial_score', 0)
-        score += financial_score * 0.45  # 45点満点
-        
+        score = (self._VALUATION_SCORES.get(valuation.get('overall_rating'), 5)
+                 + self._YIELD_SCORES.get(dividend.get('yield_rating'), 10)
+                 + financial.get('financial_score', 0) * 0.45)  # 財務は45点満点
+
         return min(100, round(score))
     
     def _generate_investment_advice(self, valuation, fair_value, dividend, financial, total_score):
@@ -3,6 +3,7 @@ import numpy as np
 from datetime import datetime, timedelta
 import math
 import json
+from scipy.stats import skew, kurtosis
 
 class PerformanceAnalyzer:
     """
@@ -26,202 +27,249 @@ class PerformanceAnalyzer:
     def calculate_comprehensive_metrics(self, trades, price_data, initial_capital):
         """
         包括的なパフォーマンス指標を計算
+        tradesはBacktestEngineの構造化配列（TRADE_DTYPE）でもlist[dict]でもよい
         """
-        if not trades:
+        if trades is None or len(trades) == 0:
             return self._empty_metrics()
-        
+
+        # 取引フィールドを列配列（SoA）に一度だけ変換し、全ヘルパーで共有する
+        arrays = self._trade_arrays(trades)
+
         # 基本統計
-        basic_stats = self._calculate_basic_stats(trades, initial_capital)
-        
+        basic_stats = self._calculate_basic_stats(arrays, initial_capital)
+
         # リスク指標
-        risk_metrics = self._calculate_risk_metrics(trades, price_data, initial_capital)
-        
+        risk_metrics = self._calculate_risk_metrics(arrays, price_data, initial_capital)
+
         # 収益性指標
-        profitability_metrics = self._calculate_profitability_metrics(trades, initial_capital)
-        
+        profitability_metrics = self._calculate_profitability_metrics(arrays, initial_capital)
+
         # 効率性指標
-        efficiency_metrics = self._calculate_efficiency_metrics(trades)
-        
+        efficiency_metrics = self._calculate_efficiency_metrics(arrays)
+
         # 市場比較指標
-        market_comparison = self._calculate_market_comparison(trades, price_data, initial_capital)
-        
+        market_comparison = self._calculate_market_comparison(arrays, price_data, initial_capital)
+
         # 月次分析
-        monthly_analysis = self._calculate_monthly_analysis(trades)
-        
-        return {
+        monthly_analysis = self._calculate_monthly_analysis(arrays)
+
+        # JSON安全化は値ごとのラップではなく最後に1パスで行う
+        return self._sanitize_metrics({
             'basic_stats': basic_stats,
             'risk_metrics': risk_metrics,
             'profitability_metrics': profitability_metrics,
             'efficiency_metrics': efficiency_metrics,
             'market_comparison': market_comparison,
             'monthly_analysis': monthly_analysis,
-            'trade_analysis': self._analyze_individual_trades(trades)
+            'trade_analysis': self._analyze_individual_trades(trades, arrays)
+        })
+
+    def _sanitize_metrics(self, obj):
+        """
+        メトリクス辞書を再帰的にJSON安全な値へ変換する
+        （float系はInfinity/NaNを0に、numpyスカラーはPython組み込み型に変換）
+        各ヘルパー内で値を個別にラップする代わりに、最終結果へ一括適用する
+        """
+        if isinstance(obj, dict):
+            return {k: self._sanitize_metrics(v) for k, v in obj.items()}
+        if isinstance(obj, list):
+            return [self._sanitize_metrics(v) for v in obj]
+        if isinstance(obj, bool):
+            return obj
+        if isinstance(obj, (int, np.integer)):
+            return int(obj)
+        if isinstance(obj, (float, np.floating)):
+            return float(obj) if math.isfinite(obj) else 0.0
+        return obj
+
+    def _trade_arrays(self, trades):
+        """
+        取引リストを列ごとのnumpy配列（SoA）に変換する
+        構造化配列はフィールド参照のみ、list[dict]は1パスで抽出する
+        """
+        n = len(trades)
+        if isinstance(trades, np.ndarray):
+            return {
+                'pnl': np.asarray(trades['profit_loss'], dtype=np.float64),
+                'pnl_pct': np.asarray(trades['profit_loss_pct'], dtype=np.float64),
+                'holding': np.asarray(trades['holding_days'], dtype=np.int64),
+                'exit_dates': pd.DatetimeIndex(trades['exit_date']),
+            }
+        return {
+            'pnl': np.fromiter((t['profit_loss'] for t in trades), np.float64, count=n),
+            'pnl_pct': np.fromiter((t['profit_loss_pct'] for t in trades), np.float64, count=n),
+            'holding': np.fromiter((t['holding_days'] for t in trades), np.int64, count=n),
+            'exit_dates': pd.DatetimeIndex([pd.Timestamp(t['exit_date']) for t in trades]),
         }
     
-    def _calculate_basic_stats(self, trades, initial_capital):
+    def _calculate_basic_stats(self, arrays, initial_capital):
         """
         基本統計を計算
         """
-        total_profit_loss = sum(trade['profit_loss'] for trade in trades)
+        pnl = arrays['pnl']
+        n = pnl.size
+        total_profit_loss = float(pnl.sum())
         final_value = initial_capital + total_profit_loss
         total_return_pct = (total_profit_loss / initial_capital) * 100 if initial_capital > 0 else 0
-        
-        winning_trades = [t for t in trades if t['profit_loss'] > 0]
-        losing_trades = [t for t in trades if t['profit_loss'] < 0]
-        
+
+        n_wins = int((pnl > 0).sum())
+        n_losses = int((pnl < 0).sum())
+
         return {
-            'total_trades': len(trades),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
-            'win_rate': self._safe_numeric((len(winning_trades) / len(trades)) * 100),
-            'total_return': self._safe_numeric(total_profit_loss),
-            'total_return_pct': self._safe_numeric(total_return_pct),
-            'avg_return_per_trade': self._safe_numeric(total_profit_loss / len(trades)),
-            'avg_return_per_trade_pct': self._safe_numeric(total_return_pct / len(trades)),
-            'avg_holding_days': self._safe_numeric(np.mean([t['holding_days'] for t in trades])),
-            'median_holding_days': self._safe_numeric(np.median([t['holding_days'] for t in trades])),
-            'initial_capital': self._safe_numeric(initial_capital),
-            'final_value': self._safe_numeric(final_value)
+            'total_trades': n,
+            'winning_trades': n_wins,
+            'losing_trades': n_losses,
+            'win_rate': (n_wins / n) * 100,
+            'total_return': total_profit_loss,
+            'total_return_pct': total_return_pct,
+            'avg_return_per_trade': total_profit_loss / n,
+            'avg_return_per_trade_pct': total_return_pct / n,
+            'avg_holding_days': float(arrays['holding'].mean()),
+            'median_holding_days': float(np.median(arrays['holding'])),
+            'initial_capital': float(initial_capital),
+            'final_value': final_value
         }
     
-    def _calculate_risk_metrics(self, trades, price_data, initial_capital):
+    def _calculate_risk_metrics(self, arrays, price_data, initial_capital):
         """
         リスク指標を計算
         """
-        if not trades:
+        if arrays['pnl'].size == 0:
             return {}
-        
+
         # ポートフォリオ価値の推移を計算
-        portfolio_values = self._calculate_portfolio_curve(trades, initial_capital)
-        
-        # 日次リターンを計算
-        daily_returns = []
-        for i in range(1, len(portfolio_values)):
-            daily_return = (portfolio_values[i] - portfolio_values[i-1]) / portfolio_values[i-1]
-            daily_returns.append(daily_return)
-        
-        if not daily_returns:
+        portfolio_values = self._calculate_portfolio_curve(arrays['pnl'], initial_capital)
+
+        # 日次リターン（差分と前日値の一括除算）
+        daily_returns = np.diff(portfolio_values) / portfolio_values[:-1]
+
+        if daily_returns.size == 0:
             return {}
-        
+
         # 最大ドローダウン
         max_drawdown, max_drawdown_duration = self._calculate_detailed_drawdown(portfolio_values)
-        
+
+        # 基本統計は1回だけ計算して使い回す
+        mean_return = float(daily_returns.mean())
+        std_return = float(daily_returns.std())
+        excess_mean = mean_return - self.risk_free_rate / 252
+
         # ボラティリティ（年率）
-        volatility = np.std(daily_returns) * math.sqrt(252)
-        
+        volatility = std_return * math.sqrt(252)
+
         # シャープレシオ
-        excess_returns = [r - self.risk_free_rate/252 for r in daily_returns]
-        sharpe_ratio = np.mean(excess_returns) / np.std(daily_returns) * math.sqrt(252) if np.std(daily_returns) > 0 else 0
-        
+        sharpe_ratio = excess_mean / std_return * math.sqrt(252) if std_return > 0 else 0
+
         # ソルティノレシオ（下方リスクのみ考慮）
-        negative_returns = [r for r in daily_returns if r < 0]
-        downside_deviation = np.std(negative_returns) if negative_returns else 0
-        sortino_ratio = np.mean(excess_returns) / downside_deviation * math.sqrt(252) if downside_deviation > 0 else 0
-        
+        negative_returns = daily_returns[daily_returns < 0]
+        downside_deviation = float(negative_returns.std()) if negative_returns.size else 0
+        sortino_ratio = excess_mean / downside_deviation * math.sqrt(252) if downside_deviation > 0 else 0
+
         # VaR (Value at Risk) 95%
-        var_95 = np.percentile(daily_returns, 5) if daily_returns else 0
-        
+        var_95 = float(np.quantile(daily_returns, 0.05))
+
         # CVaR (Conditional Value at Risk)
-        cvar_95 = np.mean([r for r in daily_returns if r <= var_95]) if daily_returns else 0
-        
+        cvar_95 = float(daily_returns[daily_returns <= var_95].mean())
+
         return {
-            'max_drawdown': self._safe_numeric(max_drawdown),
+            'max_drawdown': max_drawdown,
             'max_drawdown_duration': int(max_drawdown_duration),
-            'volatility': self._safe_numeric(volatility * 100),  # パーセント表示
-            'sharpe_ratio': self._safe_numeric(sharpe_ratio),
-            'sortino_ratio': self._safe_numeric(sortino_ratio),
-            'var_95': self._safe_numeric(var_95 * 100),
-            'cvar_95': self._safe_numeric(cvar_95 * 100),
-            'calmar_ratio': self._safe_numeric((np.mean(daily_returns) * 252 * 100) / max_drawdown if max_drawdown > 0 else 0)
+            'volatility': volatility * 100,  # パーセント表示
+            'sharpe_ratio': sharpe_ratio,
+            'sortino_ratio': sortino_ratio,
+            'var_95': var_95 * 100,
+            'cvar_95': cvar_95 * 100,
+            'calmar_ratio': (mean_return * 252 * 100) / max_drawdown if max_drawdown > 0 else 0
         }
     
-    def _calculate_profitability_metrics(self, trades, initial_capital):
+    def _calculate_profitability_metrics(self, arrays, initial_capital):
         """
         収益性指標を計算
         """
-        winning_trades = [t for t in trades if t['profit_loss'] > 0]
-        losing_trades = [t for t in trades if t['profit_loss'] < 0]
-        
-        if not winning_trades and not losing_trades:
+        pnl = arrays['pnl']
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl < 0]
+
+        if wins.size == 0 and losses.size == 0:
             return {}
-        
+
         # 平均利益・損失
-        avg_win = np.mean([t['profit_loss'] for t in winning_trades]) if winning_trades else 0
-        avg_loss = np.mean([t['profit_loss'] for t in losing_trades]) if losing_trades else 0
-        
+        avg_win = float(wins.mean()) if wins.size else 0
+        avg_loss = float(losses.mean()) if losses.size else 0
+
         # 最大利益・損失
-        max_win = max([t['profit_loss'] for t in winning_trades]) if winning_trades else 0
-        max_loss = min([t['profit_loss'] for t in losing_trades]) if losing_trades else 0
-        
+        max_win = float(wins.max()) if wins.size else 0
+        max_loss = float(losses.min()) if losses.size else 0
+
         # プロフィットファクター
-        gross_profit = sum([t['profit_loss'] for t in winning_trades])
-        gross_loss = abs(sum([t['profit_loss'] for t in losing_trades]))
+        gross_profit = float(wins.sum())
+        gross_loss = abs(float(losses.sum()))
         profit_factor = self._safe_numeric(gross_profit / gross_loss if gross_loss > 0 else 999.0, 999.0)
-        
+
         # ペイオフレシオ
         payoff_ratio = self._safe_numeric(abs(avg_win / avg_loss) if avg_loss != 0 else 999.0, 999.0)
-        
+
         # 期待値
-        win_rate = len(winning_trades) / len(trades)
+        win_rate = wins.size / pnl.size
         expectancy = (avg_win * win_rate) + (avg_loss * (1 - win_rate))
         
         return {
-            'gross_profit': self._safe_numeric(gross_profit),
-            'gross_loss': self._safe_numeric(gross_loss),
-            'avg_win': self._safe_numeric(avg_win),
-            'avg_loss': self._safe_numeric(avg_loss),
-            'max_win': self._safe_numeric(max_win),
-            'max_loss': self._safe_numeric(max_loss),
+            'gross_profit': gross_profit,
+            'gross_loss': gross_loss,
+            'avg_win': avg_win,
+            'avg_loss': avg_loss,
+            'max_win': max_win,
+            'max_loss': max_loss,
             'profit_factor': profit_factor,
             'payoff_ratio': payoff_ratio,
-            'expectancy': self._safe_numeric(expectancy),
-            'expectancy_pct': self._safe_numeric((expectancy / initial_capital) * 100)
+            'expectancy': expectancy,
+            'expectancy_pct': (expectancy / initial_capital) * 100
         }
     
-    def _calculate_efficiency_metrics(self, trades):
+    def _calculate_efficiency_metrics(self, arrays):
         """
         効率性指標を計算
         """
-        if not trades:
+        if arrays['pnl'].size == 0:
             return {}
-        
+
         # 連続勝ち・負け
-        consecutive_wins, consecutive_losses = self._calculate_consecutive_trades(trades)
-        
+        consecutive_wins, consecutive_losses = self._calculate_consecutive_trades(arrays['pnl'])
+
         # ホールド期間分析
-        holding_periods = [t['holding_days'] for t in trades]
-        
+        holding = arrays['holding']
+
         return {
             'max_consecutive_wins': max(consecutive_wins) if consecutive_wins else 0,
             'max_consecutive_losses': max(consecutive_losses) if consecutive_losses else 0,
-            'avg_consecutive_wins': self._safe_numeric(np.mean(consecutive_wins) if consecutive_wins else 0),
-            'avg_consecutive_losses': self._safe_numeric(np.mean(consecutive_losses) if consecutive_losses else 0),
-            'min_holding_days': min(holding_periods),
-            'max_holding_days': max(holding_periods),
-            'std_holding_days': self._safe_numeric(np.std(holding_periods))
+            'avg_consecutive_wins': np.mean(consecutive_wins) if consecutive_wins else 0,
+            'avg_consecutive_losses': np.mean(consecutive_losses) if consecutive_losses else 0,
+            'min_holding_days': int(holding.min()),
+            'max_holding_days': int(holding.max()),
+            'std_holding_days': float(holding.std())
         }
     
-    def _calculate_market_comparison(self, trades, price_data, initial_capital):
+    def _calculate_market_comparison(self, arrays, price_data, initial_capital):
         """
         市場比較指標を計算
         """
-        if not trades or price_data.empty:
+        if arrays['pnl'].size == 0 or price_data.empty:
             return {}
-        
+
         # バイアンドホールド戦略
         start_price = price_data['Close'].iloc[0]
         end_price = price_data['Close'].iloc[-1]
         buy_hold_return = (end_price - start_price) / start_price * 100
-        
+
         # 戦略の総リターン
-        total_profit_loss = sum(trade['profit_loss'] for trade in trades)
+        total_profit_loss = float(arrays['pnl'].sum())
         strategy_return = (total_profit_loss / initial_capital) * 100
-        
+
         # アルファ（超過収益）
         alpha = strategy_return - buy_hold_return
-        
+
         # ベータ（市場感応度）- 改良版計算
-        strategy_returns = [t['profit_loss_pct'] / 100 for t in trades]
+        strategy_returns = arrays['pnl_pct'] / 100
         if len(strategy_returns) < 2:
             # 取引数が少ない場合はデフォルト値
             beta = 1.0
@@ -247,192 +295,134 @@ class PerformanceAnalyzer:
                 strategy_market_covariance = 0.0
         
         return {
-            'buy_hold_return': self._safe_numeric(buy_hold_return),
-            'strategy_return': self._safe_numeric(strategy_return),
-            'alpha': self._safe_numeric(alpha),
-            'beta': self._safe_numeric(beta),
-            'information_ratio': self._safe_numeric(alpha / np.std(strategy_returns) if strategy_returns and np.std(strategy_returns) > 0 else 0)
+            'buy_hold_return': buy_hold_return,
+            'strategy_return': strategy_return,
+            'alpha': alpha,
+            'beta': beta,
+            'information_ratio': alpha / np.std(strategy_returns) if strategy_returns.size and np.std(strategy_returns) > 0 else 0
         }
     
-    def _calculate_monthly_analysis(self, trades):
+    def _calculate_monthly_analysis(self, arrays):
         """
         月次分析を実行
         """
-        if not trades:
+        if arrays['pnl'].size == 0:
             return {}
-        
-        # 月次グループ化
-        monthly_data = {}
-        for trade in trades:
-            month_key = trade['exit_date'].strftime('%Y-%m')
-            if month_key not in monthly_data:
-                monthly_data[month_key] = []
-            monthly_data[month_key].append(trade['profit_loss'])
-        
-        # 月次統計
-        monthly_returns = []
-        winning_months = 0
-        for month, profits in monthly_data.items():
-            monthly_return = sum(profits)
-            monthly_returns.append(monthly_return)
-            if monthly_return > 0:
-                winning_months += 1
-        
-        if not monthly_returns:
+
+        # 月次グループ化（決済月のPeriodIndexでgroupby、辞書集計を置き換え）
+        monthly_returns = (pd.Series(arrays['pnl'], index=arrays['exit_dates'].to_period('M'))
+                           .groupby(level=0).sum().to_numpy())
+
+        if monthly_returns.size == 0:
             return {}
-        
+
+        winning_months = int((monthly_returns > 0).sum())
+
         return {
             'total_months': len(monthly_returns),
             'winning_months': winning_months,
-            'monthly_win_rate': self._safe_numeric((winning_months / len(monthly_returns)) * 100),
-            'avg_monthly_return': self._safe_numeric(np.mean(monthly_returns)),
-            'best_month': self._safe_numeric(max(monthly_returns)),
-            'worst_month': self._safe_numeric(min(monthly_returns)),
-            'monthly_volatility': self._safe_numeric(np.std(monthly_returns))
+            'monthly_win_rate': (winning_months / len(monthly_returns)) * 100,
+            'avg_monthly_return': float(monthly_returns.mean()),
+            'best_month': float(monthly_returns.max()),
+            'worst_month': float(monthly_returns.min()),
+            'monthly_volatility': float(monthly_returns.std())
         }
     
-    def _analyze_individual_trades(self, trades):
+    def _analyze_individual_trades(self, trades, arrays):
         """
         個別取引分析
         """
-        if not trades:
+        if len(trades) == 0:
             return {}
-        
+
         # 取引パフォーマンスの分布
-        returns_pct = [t['profit_loss_pct'] for t in trades]
-        
+        returns_pct = arrays['pnl_pct']
+        
+        # 1取引ずつstrftime/dict生成せず、DataFrameに一括変換して
+        # 日付整形（C実装の.dt.strftime）とレコード化をまとめて行う
+        tdf = pd.DataFrame(trades)
+        tdf['entry_date'] = pd.to_datetime(tdf['entry_date']).dt.strftime('%Y-%m-%d')
+        tdf['exit_date'] = pd.to_datetime(tdf['exit_date']).dt.strftime('%Y-%m-%d')
+        tdf['entry_reason'] = tdf['entry_reason'].astype(str)
+        tdf['exit_reason'] = tdf['exit_reason'].astype(str)
+
         return {
-            'trades_detail': [
-                {
-                    'entry_date': trade['entry_date'].strftime('%Y-%m-%d'),
-                    'exit_date': trade['exit_date'].strftime('%Y-%m-%d'),
-                    'entry_price': trade['entry_price'],
-                    'exit_price': trade['exit_price'],
-                    'profit_loss': trade['profit_loss'],
-                    'profit_loss_pct': trade['profit_loss_pct'],
-                    'holding_days': trade['holding_days'],
-                    'entry_reason': trade['entry_reason'],
-                    'exit_reason': trade['exit_reason']
-                }
-                for trade in trades
-            ],
+            'trades_detail': tdf[['entry_date', 'exit_date', 'entry_price', 'exit_price',
+                                  'profit_loss', 'profit_loss_pct', 'holding_days',
+                                  'entry_reason', 'exit_reason']].to_dict('records'),
             'return_distribution': {
-                'min_return': self._safe_numeric(min(returns_pct)),
-                'max_return': self._safe_numeric(max(returns_pct)),
-                'median_return': self._safe_numeric(np.median(returns_pct)),
-                'std_return': self._safe_numeric(np.std(returns_pct)),
-                'skewness': self._safe_numeric(self._calculate_skewness(returns_pct)),
-                'kurtosis': self._safe_numeric(self._calculate_kurtosis(returns_pct))
+                'min_return': float(returns_pct.min()),
+                'max_return': float(returns_pct.max()),
+                'median_return': np.median(returns_pct),
+                'std_return': np.std(returns_pct),
+                'skewness': self._calculate_skewness(returns_pct),
+                'kurtosis': self._calculate_kurtosis(returns_pct)
             }
         }
     
-    def _calculate_portfolio_curve(self, trades, initial_capital):
+    def _calculate_portfolio_curve(self, pnl, initial_capital):
         """
-        ポートフォリオ価値の推移を計算
+        ポートフォリオ価値の推移を計算（累積和で一括構築）
         """
-        portfolio_values = [initial_capital]
-        current_value = initial_capital
-        
-        for trade in trades:
-            current_value += trade['profit_loss']
-            portfolio_values.append(current_value)
-        
-        return portfolio_values
-    
+        return np.concatenate(([initial_capital], initial_capital + np.cumsum(pnl)))
+
     def _calculate_detailed_drawdown(self, portfolio_values):
         """
         詳細なドローダウン分析
+        走査ループの代わりにランニングピーク（maximum.accumulate）と
+        ブール列のラン長検出で最大DDと最長DD期間を求める
         """
-        if len(portfolio_values) < 2:
+        values = np.asarray(portfolio_values, dtype=np.float64)
+        if values.size < 2:
             return 0.0, 0
-        
-        peak = portfolio_values[0]
-        max_drawdown = 0.0
-        max_drawdown_duration = 0
-        current_drawdown_duration = 0
-        
-        for value in portfolio_values[1:]:
-            if value > peak:
-                peak = value
-                current_drawdown_duration = 0
-            else:
-                drawdown = (peak - value) / peak
-                current_drawdown_duration += 1
-                
-                if drawdown > max_drawdown:
-                    max_drawdown = drawdown
-                
-                if current_drawdown_duration > max_drawdown_duration:
-                    max_drawdown_duration = current_drawdown_duration
-        
+
+        peaks = np.maximum.accumulate(values)
+        max_drawdown = float(((peaks - values) / peaks).max())
+
+        # ドローダウン継続バー数 = 直前までのピークを更新できなかった連続区間の最長
+        in_drawdown = values[1:] <= peaks[:-1]
+        padded = np.concatenate(([False], in_drawdown, [False]))
+        edges = np.flatnonzero(np.diff(padded.astype(np.int8)))
+        run_lengths = edges[1::2] - edges[::2]
+        max_drawdown_duration = int(run_lengths.max()) if run_lengths.size else 0
+
         return max_drawdown * 100, max_drawdown_duration
     
-    def _calculate_consecutive_trades(self, trades):
+    def _calculate_consecutive_trades(self, pnl):
         """
-        連続勝ち負けを計算
+        連続勝ち負けを計算（勝敗ブール列のラン長エンコーディングで一括算出）
         """
-        consecutive_wins = []
-        consecutive_losses = []
-        current_wins = 0
-        current_losses = 0
-        
-        for trade in trades:
-            if trade['profit_loss'] > 0:
-                current_wins += 1
-                if current_losses > 0:
-                    consecutive_losses.append(current_losses)
-                    current_losses = 0
-            else:
-                current_losses += 1
-                if current_wins > 0:
-                    consecutive_wins.append(current_wins)
-                    current_wins = 0
-        
-        # 最後のシーケンスを追加
-        if current_wins > 0:
-            consecutive_wins.append(current_wins)
-        if current_losses > 0:
-            consecutive_losses.append(current_losses)
-        
-        return consecutive_wins, consecutive_losses
+        if pnl.size == 0:
+            return [], []
+
+        wins = pnl > 0
+        change_idx = np.flatnonzero(np.diff(wins)) + 1
+        boundaries = np.concatenate(([0], change_idx, [wins.size]))
+        run_lengths = np.diff(boundaries)
+        run_is_win = wins[boundaries[:-1]]
+
+        return run_lengths[run_is_win].tolist(), run_lengths[~run_is_win].tolist()
     
     def _calculate_skewness(self, data):
         """
-        歪度を計算
+        歪度を計算（バイアス補正済みサンプル歪度、C実装）
         """
         try:
             if len(data) < 3:
                 return 0.0
-            
-            mean = np.mean(data)
-            std = np.std(data)
-            n = len(data)
-            
-            if std == 0 or n <= 2:
-                return 0.0
-            
-            skewness = (n / ((n - 1) * (n - 2))) * sum(((x - mean) / std) ** 3 for x in data)
-            return self._safe_numeric(skewness)
+            return self._safe_numeric(float(skew(np.asarray(data, dtype=np.float64), bias=False)))
         except:
             return 0.0
-    
+
     def _calculate_kurtosis(self, data):
         """
-        尖度を計算
+        尖度を計算（バイアス補正済み超過尖度、C実装）
         """
         try:
             if len(data) < 4:
                 return 0.0
-            
-            mean = np.mean(data)
-            std = np.std(data)
-            n = len(data)
-            
-            if std == 0 or n <= 3:
-                return 0.0
-            
-            kurtosis = (n * (n + 1) / ((n - 1) * (n - 2) * (n - 3))) * sum(((x - mean) / std) ** 4 for x in data) - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
-            return self._safe_numeric(kurtosis)
+            return self._safe_numeric(float(kurtosis(np.asarray(data, dtype=np.float64),
+                                                     fisher=True, bias=False)))
         except:
             return 0.0
     
@@ -455,4 +445,56 @@ class PerformanceAnalyzer:
             'market_comparison': {},
             'monthly_analysis': {},
             'trade_analysis': {}
+        }
+
+
+class StreamingPerformanceTracker:
+    """
+    取引を1件ずつ追記しながらドローダウン系指標をO(1)で更新するトラッカー
+    バッチ分析（_calculate_detailed_drawdown）は全曲線をO(n)で再構築するが、
+    ライブ運用のように取引が逐次確定する場面では、ランニングピークと
+    継続バー数だけを保持して差分更新すれば再計算が不要になる
+    """
+    def __init__(self, initial_capital):
+        self.initial_capital = float(initial_capital)
+        self._value = float(initial_capital)
+        self._peak = float(initial_capital)
+        self._max_dd = 0.0
+        self._cur_dd_len = 0
+        self._max_dd_len = 0
+        self._n_trades = 0
+
+    def update(self, pnl):
+        """
+        確定した1取引の損益を反映する
+        """
+        self._value += float(pnl)
+        self._n_trades += 1
+
+        if self._value > self._peak:
+            self._peak = self._value
+            self._cur_dd_len = 0
+        else:
+            if self._peak > 0:
+                drawdown = (self._peak - self._value) / self._peak
+                if drawdown > self._max_dd:
+                    self._max_dd = drawdown
+            self._cur_dd_len += 1
+            if self._cur_dd_len > self._max_dd_len:
+                self._max_dd_len = self._cur_dd_len
+
+    def metrics(self):
+        """
+        現時点のスナップショットを返す（_calculate_detailed_drawdownと同じ定義）
+        """
+        total_return = self._value - self.initial_capital
+        return {
+            'total_trades': self._n_trades,
+            'current_value': self._value,
+            'peak_value': self._peak,
+            'total_return': total_return,
+            'total_return_pct': (total_return / self.initial_capital * 100
+                                 if self.initial_capital else 0.0),
+            'max_drawdown': self._max_dd * 100,
+            'max_drawdown_duration': self._max_dd_len
         }
\ No newline at end of file
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 from abc import ABC, abstractmethod
+import concurrent.futures
 
 class BaseStrategy(ABC):
     """
@@ -50,31 +51,27 @@ class RSIStrategy(BaseStrategy):
     
     def generate_signals(self, df):
         """
-        RSIシグナル生成
+        RSIシグナル生成（全行を配列比較で一括判定）
         """
-        signals = pd.DataFrame(index=df.index)
-        signals['buy_signal'] = False
-        signals['sell_signal'] = False
-        signals['signal_strength'] = 0.0
-        signals['signal_reason'] = ''
-        
-        for i in range(len(df)):
-            if pd.isna(df['RSI'].iloc[i]):
-                continue
-                
-            current_date = df.index[i]
-            rsi = df['RSI'].iloc[i]
-            
-            if rsi <= self.params['oversold_threshold']:
-                signals.loc[current_date, 'buy_signal'] = True
-                signals.loc[current_date, 'signal_strength'] = 0.8
-                signals.loc[current_date, 'signal_reason'] = f'RSI売られすぎ({rsi:.1f})'
-            elif rsi >= self.params['overbought_threshold']:
-                signals.loc[current_date, 'sell_signal'] = True
-                signals.loc[current_date, 'signal_strength'] = 0.8
-                signals.loc[current_date, 'signal_reason'] = f'RSI買われすぎ({rsi:.1f})'
-        
-        return signals
+        rsi = df['RSI'].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(rsi)
+
+        buy_mask = valid & (rsi <= self.params['oversold_threshold'])
+        sell_mask = valid & (rsi >= self.params['overbought_threshold']) & ~buy_mask
+
+        # 理由文字列はシグナル行（疎）だけ整形する
+        reasons = np.full(len(rsi), '', dtype=object)
+        for i in np.flatnonzero(buy_mask):
+            reasons[i] = f'RSI売られすぎ({rsi[i]:.1f})'
+        for i in np.flatnonzero(sell_mask):
+            reasons[i] = f'RSI買われすぎ({rsi[i]:.1f})'
+
+        return pd.DataFrame({
+            'buy_signal': buy_mask,
+            'sell_signal': sell_mask,
+            'signal_strength': np.where(buy_mask | sell_mask, 0.8, 0.0).astype(np.float32),
+            'signal_reason': reasons
+        }, index=df.index)
 
 class GoldenCrossStrategy(BaseStrategy):
     """
@@ -95,38 +92,34 @@ class GoldenCrossStrategy(BaseStrategy):
     
     def generate_signals(self, df):
         """
-        ゴールデンクロスシグナル生成
+        ゴールデンクロスシグナル生成（前日との比較を配列シフトで一括判定）
         """
-        signals = pd.DataFrame(index=df.index)
-        signals['buy_signal'] = False
-        signals['sell_signal'] = False
-        signals['signal_strength'] = 0.0
-        signals['signal_reason'] = ''
-        
-        for i in range(1, len(df)):
-            if (pd.isna(df['SMA_25'].iloc[i]) or pd.isna(df['SMA_75'].iloc[i]) or
-                pd.isna(df['SMA_25'].iloc[i-1]) or pd.isna(df['SMA_75'].iloc[i-1])):
-                continue
-            
-            current_date = df.index[i]
-            prev_short = df['SMA_25'].iloc[i-1]
-            prev_long = df['SMA_75'].iloc[i-1]
-            curr_short = df['SMA_25'].iloc[i]
-            curr_long = df['SMA_75'].iloc[i]
-            
+        short = df['SMA_25'].to_numpy(dtype=np.float64)
+        long = df['SMA_75'].to_numpy(dtype=np.float64)
+        n = len(short)
+
+        valid = ~np.isnan(short) & ~np.isnan(long)
+        buy_mask = np.zeros(n, dtype=bool)
+        sell_mask = np.zeros(n, dtype=bool)
+        if n > 1:
+            both_valid = valid[1:] & valid[:-1]
             # ゴールデンクロス検出
-            if prev_short <= prev_long and curr_short > curr_long:
-                signals.loc[current_date, 'buy_signal'] = True
-                signals.loc[current_date, 'signal_strength'] = 0.9
-                signals.loc[current_date, 'signal_reason'] = 'ゴールデンクロス'
-            
+            buy_mask[1:] = both_valid & (short[:-1] <= long[:-1]) & (short[1:] > long[1:])
             # デッドクロス検出
-            elif prev_short >= prev_long and curr_short < curr_long:
-                signals.loc[current_date, 'sell_signal'] = True
-                signals.loc[current_date, 'signal_strength'] = 0.9
-                signals.loc[current_date, 'signal_reason'] = 'デッドクロス'
-        
-        return signals
+            sell_mask[1:] = both_valid & (short[:-1] >= long[:-1]) & (short[1:] < long[1:])
+
+        # 理由の語彙は固定3種なのでCategorical（int8コード + 共有辞書）で保持
+        reasons = np.full(n, '', dtype=object)
+        reasons[buy_mask] = 'ゴールデンクロス'
+        reasons[sell_mask] = 'デッドクロス'
+        reasons = pd.Categorical(reasons, categories=['', 'ゴールデンクロス', 'デッドクロス'])
+
+        return pd.DataFrame({
+            'buy_signal': buy_mask,
+            'sell_signal': sell_mask,
+            'signal_strength': np.where(buy_mask | sell_mask, 0.9, 0.0).astype(np.float32),
+            'signal_reason': reasons
+        }, index=df.index)
 
 class MACDStrategy(BaseStrategy):
     """
@@ -148,36 +141,33 @@ class MACDStrategy(BaseStrategy):
     
     def generate_signals(self, df):
         """
-        MACDシグナル生成
+        MACDシグナル生成（ヒストグラムのゼロクロスを配列シフトで一括判定）
         """
-        signals = pd.DataFrame(index=df.index)
-        signals['buy_signal'] = False
-        signals['sell_signal'] = False
-        signals['signal_strength'] = 0.0
-        signals['signal_reason'] = ''
-        
-        for i in range(1, len(df)):
-            if (pd.isna(df['MACD_histogram'].iloc[i]) or 
-                pd.isna(df['MACD_histogram'].iloc[i-1])):
-                continue
-            
-            current_date = df.index[i]
-            prev_hist = df['MACD_histogram'].iloc[i-1]
-            curr_hist = df['MACD_histogram'].iloc[i]
-            
+        hist = df['MACD_histogram'].to_numpy(dtype=np.float64)
+        n = len(hist)
+
+        valid = ~np.isnan(hist)
+        buy_mask = np.zeros(n, dtype=bool)
+        sell_mask = np.zeros(n, dtype=bool)
+        if n > 1:
+            both_valid = valid[1:] & valid[:-1]
             # MACDゴールデンクロス
-            if prev_hist <= 0 and curr_hist > 0:
-                signals.loc[current_date, 'buy_signal'] = True
-                signals.loc[current_date, 'signal_strength'] = 0.8
-                signals.loc[current_date, 'signal_reason'] = 'MACDゴールデンクロス'
-            
+            buy_mask[1:] = both_valid & (hist[:-1] <= 0) & (hist[1:] > 0)
             # MACDデッドクロス
-            elif prev_hist >= 0 and curr_hist < 0:
-                signals.loc[current_date, 'sell_signal'] = True
-                signals.loc[current_date, 'signal_strength'] = 0.8
-                signals.loc[current_date, 'signal_reason'] = 'MACDデッドクロス'
-        
-        return signals
+            sell_mask[1:] = both_valid & (hist[:-1] >= 0) & (hist[1:] < 0)
+
+        # 理由の語彙は固定3種なのでCategorical（int8コード + 共有辞書）で保持
+        reasons = np.full(n, '', dtype=object)
+        reasons[buy_mask] = 'MACDゴールデンクロス'
+        reasons[sell_mask] = 'MACDデッドクロス'
+        reasons = pd.Categorical(reasons, categories=['', 'MACDゴールデンクロス', 'MACDデッドクロス'])
+
+        return pd.DataFrame({
+            'buy_signal': buy_mask,
+            'sell_signal': sell_mask,
+            'signal_strength': np.where(buy_mask | sell_mask, 0.8, 0.0).astype(np.float32),
+            'signal_reason': reasons
+        }, index=df.index)
 
 class BollingerBandStrategy(BaseStrategy):
     """
@@ -198,36 +188,29 @@ class BollingerBandStrategy(BaseStrategy):
     
     def generate_signals(self, df):
         """
-        ボリンジャーバンドシグナル生成
+        ボリンジャーバンドシグナル生成（バンドタッチを配列比較で一括判定）
         """
-        signals = pd.DataFrame(index=df.index)
-        signals['buy_signal'] = False
-        signals['sell_signal'] = False
-        signals['signal_strength'] = 0.0
-        signals['signal_reason'] = ''
-        
-        for i in range(len(df)):
-            if (pd.isna(df['BB_upper'].iloc[i]) or pd.isna(df['BB_lower'].iloc[i])):
-                continue
-            
-            current_date = df.index[i]
-            close = df['Close'].iloc[i]
-            bb_upper = df['BB_upper'].iloc[i]
-            bb_lower = df['BB_lower'].iloc[i]
-            
-            # 下限タッチで買い
-            if close <= bb_lower:
-                signals.loc[current_date, 'buy_signal'] = True
-                signals.loc[current_date, 'signal_strength'] = 0.7
-                signals.loc[current_date, 'signal_reason'] = 'ボリンジャー下限タッチ'
-            
-            # 上限タッチで売り
-            elif close >= bb_upper:
-                signals.loc[current_date, 'sell_signal'] = True
-                signals.loc[current_date, 'signal_strength'] = 0.7
-                signals.loc[current_date, 'signal_reason'] = 'ボリンジャー上限タッチ'
-        
-        return signals
+        close = df['Close'].to_numpy(dtype=np.float64)
+        upper = df['BB_upper'].to_numpy(dtype=np.float64)
+        lower = df['BB_lower'].to_numpy(dtype=np.float64)
+
+        valid = ~np.isnan(upper) & ~np.isnan(lower)
+        # 下限タッチで買い、上限タッチで売り
+        buy_mask = valid & (close <= lower)
+        sell_mask = valid & (close >= upper) & ~buy_mask
+
+        # 理由の語彙は固定3種なのでCategorical（int8コード + 共有辞書）で保持
+        reasons = np.full(len(close), '', dtype=object)
+        reasons[buy_mask] = 'ボリンジャー下限タッチ'
+        reasons[sell_mask] = 'ボリンジャー上限タッチ'
+        reasons = pd.Categorical(reasons, categories=['', 'ボリンジャー下限タッチ', 'ボリンジャー上限タッチ'])
+
+        return pd.DataFrame({
+            'buy_signal': buy_mask,
+            'sell_signal': sell_mask,
+            'signal_strength': np.where(buy_mask | sell_mask, 0.7, 0.0).astype(np.float32),
+            'signal_reason': reasons
+        }, index=df.index)
 
 class ComboStrategy(BaseStrategy):
     """
@@ -252,74 +235,73 @@ class ComboStrategy(BaseStrategy):
         """
         複合シグナル生成
         """
-        signals = pd.DataFrame(index=df.index)
-        signals['buy_signal'] = False
-        signals['sell_signal'] = False
-        signals['signal_strength'] = 0.0
-        signals['signal_reason'] = ''
-        
-        # 各戦略のインスタンス作成
-        rsi_strategy = RSIStrategy()
-        ma_strategy = GoldenCrossStrategy()
-        macd_strategy = MACDStrategy()
-        bb_strategy = BollingerBandStrategy()
-        
-        # 各戦略のシグナル取得
-        rsi_signals = rsi_strategy.generate_signals(df)
-        ma_signals = ma_strategy.generate_signals(df)
-        macd_signals = macd_strategy.generate_signals(df)
-        bb_signals = bb_strategy.generate_signals(df)
-        
-        for i in range(len(df)):
-            current_date = df.index[i]
-            
-            buy_score = 0.0
-            sell_score = 0.0
-            reasons = []
-            
-            # RSIスコア
-            if rsi_signals.loc[current_date, 'buy_signal']:
-                buy_score += self.params['rsi_weight']
-                reasons.append('RSI買い')
-            elif rsi_signals.loc[current_date, 'sell_signal']:
-                sell_score += self.params['rsi_weight']
-                reasons.append('RSI売り')
-            
-            # 移動平均スコア
-            if ma_signals.loc[current_date, 'buy_signal']:
-                buy_score += self.params['ma_weight']
-                reasons.append('MA買い')
-            elif ma_signals.loc[current_date, 'sell_signal']:
-                sell_score += self.params['ma_weight']
-                reasons.append('MA売り')
-            
-            # MACDスコア
-            if macd_signals.loc[current_date, 'buy_signal']:
-                buy_score += self.params['macd_weight']
-                reasons.append('MACD買い')
-            elif macd_signals.loc[current_date, 'sell_signal']:
-                sell_score += self.params['macd_weight']
-                reasons.append('MACD売り')
-            
-            # ボリンジャーバンドスコア
-            if bb_signals.loc[current_date, 'buy_signal']:
-                buy_score += self.params['bb_weight']
-                reasons.append('BB買い')
-            elif bb_signals.loc[current_date, 'sell_signal']:
-                sell_score += self.params['bb_weight']
-                reasons.append('BB売り')
-            
-            # 最終判定
-            if buy_score >= self.params['buy_threshold']:
-                signals.loc[current_date, 'buy_signal'] = True
-                signals.loc[current_date, 'signal_strength'] = buy_score
-                signals.loc[current_date, 'signal_reason'] = ' | '.join(reasons)
-            elif sell_score >= self.params['sell_threshold']:
-                signals.loc[current_date, 'sell_signal'] = True
-                signals.loc[current_date, 'signal_strength'] = sell_score
-                signals.loc[current_date, 'signal_reason'] = ' | '.join(reasons)
-        
-        return signals
+        n = len(df)
+
+        # 各指標のマスクを生データから直接計算する（サブ戦略のDataFrame構築
+        # と5回の走査をなくし、1パスの配列演算に融合）
+        # 判定ロジックと閾値は各サブ戦略のデフォルトと同一
+        rsi_params = RSIStrategy().params
+        rsi = df['RSI'].to_numpy(dtype=np.float64)
+        rsi_valid = ~np.isnan(rsi)
+        rsi_buy = rsi_valid & (rsi <= rsi_params['oversold_threshold'])
+        rsi_sell = rsi_valid & (rsi >= rsi_params['overbought_threshold']) & ~rsi_buy
+
+        short = df['SMA_25'].to_numpy(dtype=np.float64)
+        long = df['SMA_75'].to_numpy(dtype=np.float64)
+        ma_valid = ~np.isnan(short) & ~np.isnan(long)
+        ma_buy = np.zeros(n, dtype=bool)
+        ma_sell = np.zeros(n, dtype=bool)
+        if n > 1:
+            both = ma_valid[1:] & ma_valid[:-1]
+            ma_buy[1:] = both & (short[:-1] <= long[:-1]) & (short[1:] > long[1:])
+            ma_sell[1:] = both & (short[:-1] >= long[:-1]) & (short[1:] < long[1:])
+
+        hist = df['MACD_histogram'].to_numpy(dtype=np.float64)
+        hist_valid = ~np.isnan(hist)
+        macd_buy = np.zeros(n, dtype=bool)
+        macd_sell = np.zeros(n, dtype=bool)
+        if n > 1:
+            both = hist_valid[1:] & hist_valid[:-1]
+            macd_buy[1:] = both & (hist[:-1] <= 0) & (hist[1:] > 0)
+            macd_sell[1:] = both & (hist[:-1] >= 0) & (hist[1:] < 0)
+
+        close = df['Close'].to_numpy(dtype=np.float64)
+        upper = df['BB_upper'].to_numpy(dtype=np.float64)
+        lower = df['BB_lower'].to_numpy(dtype=np.float64)
+        bb_valid = ~np.isnan(upper) & ~np.isnan(lower)
+        bb_buy = bb_valid & (close <= lower)
+        bb_sell = bb_valid & (close >= upper) & ~bb_buy
+
+        # 重み付きスコア（bool×floatのブロードキャスト）
+        buy_score = (rsi_buy * self.params['rsi_weight']
+                     + ma_buy * self.params['ma_weight']
+                     + macd_buy * self.params['macd_weight']
+                     + bb_buy * self.params['bb_weight'])
+        sell_score = (rsi_sell * self.params['rsi_weight']
+                      + ma_sell * self.params['ma_weight']
+                      + macd_sell * self.params['macd_weight']
+                      + bb_sell * self.params['bb_weight'])
+
+        # 最終判定（買いが先勝ち）
+        buy_mask = buy_score >= self.params['buy_threshold']
+        sell_mask = ~buy_mask & (sell_score >= self.params['sell_threshold'])
+
+        # 理由文字列はシグナル行（疎）だけ組み立てる
+        reason_parts = [('RSI買い', rsi_buy), ('RSI売り', rsi_sell),
+                        ('MA買い', ma_buy), ('MA売り', ma_sell),
+                        ('MACD買い', macd_buy), ('MACD売り', macd_sell),
+                        ('BB買い', bb_buy), ('BB売り', bb_sell)]
+        reasons = np.full(n, '', dtype=object)
+        for i in np.flatnonzero(buy_mask | sell_mask):
+            reasons[i] = ' | '.join(label for label, mask in reason_parts if mask[i])
+
+        return pd.DataFrame({
+            'buy_signal': buy_mask,
+            'sell_signal': sell_mask,
+            'signal_strength': np.where(buy_mask, buy_score,
+                                        np.where(sell_mask, sell_score, 0.0)).astype(np.float32),
+            'signal_reason': reasons
+        }, index=df.index)
 
 class StrategyManager:
     """
@@ -340,6 +322,18 @@ class StrategyManager:
         """
         return self.strategies.get(strategy_name)
     
+    def run_all(self, df, max_workers=None):
+        """
+        全ストラテジーのシグナルを同一DataFrameに対してまとめて生成する
+        （strategy_id -> signals DataFrame の辞書を返す）
+        ベクトル化済みのgenerate_signalsはnumpy演算中にGILを放すため、
+        スレッドプールで十分に並列化できる（プロセス間のデータ転送も不要）
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
+            futures = {key: ex.submit(strategy.generate_signals, df)
+                       for key, strategy in self.strategies.items()}
+            return {key: future.result() for key, future in futures.items()}
+
     def get_available_strategies(self):
         """
         利用可能なストラテジー一覧を取得
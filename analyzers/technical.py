@@ -1,63 +1,325 @@
+import hashlib
+import logging
+
 import pandas as pd
 import numpy as np
-from ta.trend import SMAIndicator, MACD
-from ta.momentum import RSIIndicator, StochasticOscillator
-from ta.volatility import BollingerBands, AverageTrueRange
+from ta.volatility import AverageTrueRange
+
+logger = logging.getLogger(__name__)
+
+# 同一終値系列に対する指標の再計算を避けるメモ化キャッシュ
+# （analyze → スイング分析のように同じ銘柄・期間で複数入口から呼ばれるため）
+_INDICATOR_CACHE_MAX = 32
+_indicator_cache = {}
+
+
+def _sma(series, window):
+    """単純移動平均（累積和の差分で全ウィンドウを一括計算）"""
+    arr = np.asarray(series, dtype=np.float64)
+    out = np.full(arr.shape, np.nan)
+    if arr.size >= window:
+        cumsum = np.cumsum(np.insert(arr, 0, 0.0))
+        out[window - 1:] = (cumsum[window:] - cumsum[:-window]) / window
+    return pd.Series(out, index=series.index)
+
+
+def _rsi(close, window=14):
+    """RSI（ta.momentum.RSIIndicatorと同一の計算式）"""
+    diff = close.diff(1)
+    up = diff.where(diff > 0, 0.0)
+    down = -diff.where(diff < 0, 0.0)
+    ema_up = up.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+    ema_down = down.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+    return pd.Series(np.where(ema_down == 0, 100, 100 - 100 / (1 + ema_up / ema_down)),
+                     index=close.index)
+
+
+def _bollinger_bands(close, window=20, window_dev=2):
+    """ボリンジャーバンド（upper, middle, lower, バンド幅% の順に返す）"""
+    middle = close.rolling(window).mean()
+    dev = window_dev * close.rolling(window).std(ddof=0)
+    upper = middle + dev
+    lower = middle - dev
+    return upper, middle, lower, (upper - lower) / middle * 100
+
+
+def _macd(close, window_fast=12, window_slow=26, window_sign=9):
+    """MACD（line, signal, histogram の順に返す）"""
+    ema_fast = close.ewm(span=window_fast, min_periods=window_fast, adjust=False).mean()
+    ema_slow = close.ewm(span=window_slow, min_periods=window_slow, adjust=False).mean()
+    line = ema_fast - ema_slow
+    signal = line.ewm(span=window_sign, min_periods=window_sign, adjust=False).mean()
+    return line, signal, line - signal
+
+
+def _stochastic(high, low, close, window=14, smooth_window=3):
+    """ストキャスティクス（%K, %D の順に返す）"""
+    lowest = low.rolling(window).min()
+    highest = high.rolling(window).max()
+    k = 100 * (close - lowest) / (highest - lowest)
+    return k, k.rolling(smooth_window).mean()
+
+
+# 同一日付リストの再パースを避けるメモ化キャッシュ（DatetimeIndexは不変なので共有できる）
+_DATE_INDEX_CACHE_MAX = 32
+_date_index_cache = {}
+
+
+def _parse_dates(dates):
+    """日付文字列リストをDatetimeIndexへ変換する（内容ハッシュでメモ化）"""
+    joined = '\n'.join(map(str, dates))
+    key = (hashlib.blake2b(joined.encode(), digest_size=16).hexdigest(), len(dates))
+    cached = _date_index_cache.get(key)
+    if cached is None:
+        try:
+            # data_fetcherの日付は'%Y-%m-%d'固定なので書式推論を飛ばす
+            cached = pd.to_datetime(dates, format='%Y-%m-%d')
+        except ValueError:
+            cached = pd.to_datetime(dates)
+        cached.name = 'Date'
+        if len(_date_index_cache) >= _DATE_INDEX_CACHE_MAX:
+            _date_index_cache.pop(next(iter(_date_index_cache)))
+        _date_index_cache[key] = cached
+    return cached
+
+
+def _price_frame(stock_data):
+    """
+    stock_dataの価格データをDatetimeIndex付きDataFrameへ変換する
+    data_fetcherは列指向のNumPy配列辞書を渡すためcopy=Falseでゼロコピー構築できる
+    （旧形式の列リスト辞書・行辞書リストもpd.DataFrameがそのまま受け付ける）
+    """
+    df = pd.DataFrame(stock_data['prices'], copy=False)
+    df.index = _parse_dates(stock_data['dates'])
+    return df
+
+
+def _common_indicators(close):
+    """
+    終値ベースの共通指標（SMA・ボリンジャー・RSI・MACD）を一括計算する
+    結果は内容ハッシュでメモ化したndarrayの辞書として返す
+    （Seriesではなく配列を返すことで、呼び出し側のindex差異の影響を受けない）
+    """
+    arr = np.ascontiguousarray(np.asarray(close, dtype=np.float64))
+    key = (hashlib.blake2b(arr.tobytes(), digest_size=16).hexdigest(), arr.size)
+    cached = _indicator_cache.get(key)
+    if cached is not None:
+        return cached
+
+    series = pd.Series(arr)
+    upper, middle, lower, squeeze = _bollinger_bands(series, window=20, window_dev=2)
+    macd_line, macd_signal, macd_histogram = \
+        _macd(series, window_fast=12, window_slow=26, window_sign=9)
+    result = {
+        'SMA_5': _sma(series, 5).to_numpy(),
+        'SMA_25': _sma(series, 25).to_numpy(),
+        'SMA_75': _sma(series, 75).to_numpy(),
+        'BB_upper': upper.to_numpy(),
+        'BB_middle': middle.to_numpy(),
+        'BB_lower': lower.to_numpy(),
+        'BB_squeeze': squeeze.to_numpy(),
+        'RSI': _rsi(series, window=14).to_numpy(),
+        'MACD': macd_line.to_numpy(),
+        'MACD_signal': macd_signal.to_numpy(),
+        'MACD_histogram': macd_histogram.to_numpy(),
+    }
+    if len(_indicator_cache) >= _INDICATOR_CACHE_MAX:
+        _indicator_cache.pop(next(iter(_indicator_cache)))
+    _indicator_cache[key] = result
+    return result
+
+class StreamingTechnical:
+    """
+    終値を1本ずつ取り込み、最新の終値ベース指標をO(1)で更新する
+    ライブ更新時に全履歴を再計算せず、直近ウィンドウと再帰状態だけを保持する
+    出力は_common_indicatorsの末尾値と一致する（計算不能期間はNone）
+    """
+
+    _SMA_WINDOWS = (5, 25, 75)
+    _BB_WINDOW = 20
+    _RSI_WINDOW = 14
+    _MACD_FAST = 12
+    _MACD_SLOW = 26
+    _MACD_SIGN = 9
+
+    def __init__(self, closes=None):
+        import collections
+        self._n = 0
+        # SMA: ウィンドウ分のdequeと累積和（差し替え1回で更新）
+        self._sma_buf = {w: collections.deque(maxlen=w) for w in self._SMA_WINDOWS}
+        self._sma_sum = {w: 0.0 for w in self._SMA_WINDOWS}
+        # ボリンジャー: 和と二乗和でO(1)標準偏差
+        self._bb_buf = collections.deque(maxlen=self._BB_WINDOW)
+        self._bb_sum = 0.0
+        self._bb_sumsq = 0.0
+        # RSI: Wilder平滑の再帰状態
+        self._prev_close = None
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        # MACD: EMAの再帰状態（min_periods到達前も再帰自体は進める）
+        self._ema_fast = None
+        self._ema_slow = None
+        self._macd_signal = None
+        self._macd_count = 0
+        if closes is not None:
+            for close in np.asarray(closes, dtype=np.float64):
+                self.update(close)
+
+    def update(self, close):
+        """新しい終値を1本取り込み、最新指標の辞書を返す"""
+        close = float(close)
+        self._n += 1
+
+        for w in self._SMA_WINDOWS:
+            buf = self._sma_buf[w]
+            if len(buf) == w:
+                self._sma_sum[w] -= buf[0]
+            buf.append(close)
+            self._sma_sum[w] += close
+
+        if len(self._bb_buf) == self._BB_WINDOW:
+            oldest = self._bb_buf[0]
+            self._bb_sum -= oldest
+            self._bb_sumsq -= oldest * oldest
+        self._bb_buf.append(close)
+        self._bb_sum += close
+        self._bb_sumsq += close * close
+
+        # RSI（初日は差分なし＝gain/loss 0で再帰を開始、ta実装と同じ）
+        alpha = 1.0 / self._RSI_WINDOW
+        gain = loss = 0.0
+        if self._prev_close is not None:
+            diff = close - self._prev_close
+            gain = diff if diff > 0 else 0.0
+            loss = -diff if diff < 0 else 0.0
+        if self._n == 1:
+            self._avg_gain = gain
+            self._avg_loss = loss
+        else:
+            self._avg_gain += alpha * (gain - self._avg_gain)
+            self._avg_loss += alpha * (loss - self._avg_loss)
+        self._prev_close = close
+
+        # MACD（シグナル線の再帰はMACD線が計算可能になった時点から始める）
+        if self._ema_fast is None:
+            self._ema_fast = close
+            self._ema_slow = close
+        else:
+            self._ema_fast += 2.0 / (self._MACD_FAST + 1) * (close - self._ema_fast)
+            self._ema_slow += 2.0 / (self._MACD_SLOW + 1) * (close - self._ema_slow)
+        if self._n >= self._MACD_SLOW:
+            macd = self._ema_fast - self._ema_slow
+            self._macd_count += 1
+            if self._macd_count == 1:
+                self._macd_signal = macd
+            else:
+                self._macd_signal += 2.0 / (self._MACD_SIGN + 1) * (macd - self._macd_signal)
+
+        return self.snapshot()
+
+    def snapshot(self):
+        """最新の指標値の辞書を返す（データ不足の指標はNone）"""
+        result = {}
+        for w in self._SMA_WINDOWS:
+            result[f'sma_{w}'] = self._sma_sum[w] / w if self._n >= w else None
+
+        if self._n >= self._BB_WINDOW:
+            mean = self._bb_sum / self._BB_WINDOW
+            var = max(self._bb_sumsq / self._BB_WINDOW - mean * mean, 0.0)
+            dev = 2.0 * var ** 0.5
+            result['bb_upper'] = mean + dev
+            result['bb_middle'] = mean
+            result['bb_lower'] = mean - dev
+            result['bb_squeeze'] = 2.0 * dev / mean * 100
+        else:
+            result['bb_upper'] = result['bb_middle'] = None
+            result['bb_lower'] = result['bb_squeeze'] = None
+
+        if self._n >= self._RSI_WINDOW:
+            if self._avg_loss == 0:
+                result['rsi'] = 100.0
+            else:
+                result['rsi'] = 100 - 100 / (1 + self._avg_gain / self._avg_loss)
+        else:
+            result['rsi'] = None
+
+        if self._n >= self._MACD_SLOW:
+            result['macd'] = self._ema_fast - self._ema_slow
+        else:
+            result['macd'] = None
+        if self._macd_count >= self._MACD_SIGN:
+            result['macd_signal'] = self._macd_signal
+            result['macd_histogram'] = result['macd'] - self._macd_signal
+        else:
+            result['macd_signal'] = None
+            result['macd_histogram'] = None
+
+        return result
+
+
+def _analyze_job(stock_data):
+    """
+    analyze_batchのワーカー（ProcessPoolExecutorからpickle可能なモジュール関数）
+    """
+    try:
+        return TechnicalAnalyzer().analyze(stock_data)
+    except Exception as e:
+        return {'error': str(e)}
+
 
 class TechnicalAnalyzer:
     def analyze(self, stock_data):
         # DataFrameに変換
-        df = pd.DataFrame(stock_data['prices'])
-        df['Date'] = pd.to_datetime(stock_data['dates'])
-        df.set_index('Date', inplace=True)
-        
-        # 移動平均線
-        df['SMA_5'] = SMAIndicator(close=df['Close'], window=5).sma_indicator()
-        df['SMA_25'] = SMAIndicator(close=df['Close'], window=25).sma_indicator()
-        df['SMA_75'] = SMAIndicator(close=df['Close'], window=75).sma_indicator()
-        
-        # ゴールデンクロス検出
-        golden_crosses = self._detect_golden_cross(df)
-        
-        # RSI
-        df['RSI'] = RSIIndicator(close=df['Close'], window=14).rsi()
-        
-        # ボリンジャーバンド
-        bb_indicator = BollingerBands(close=df['Close'], window=20, window_dev=2)
-        df['BB_upper'] = bb_indicator.bollinger_hband()
-        df['BB_middle'] = bb_indicator.bollinger_mavg()
-        df['BB_lower'] = bb_indicator.bollinger_lband()
-        df['BB_squeeze'] = bb_indicator.bollinger_wband()
-        
-        # MACD
-        macd_indicator = MACD(close=df['Close'], window_slow=26, window_fast=12, window_sign=9)
-        df['MACD'] = macd_indicator.macd()
-        df['MACD_signal'] = macd_indicator.macd_signal()
-        df['MACD_histogram'] = macd_indicator.macd_diff()
+        df = _price_frame(stock_data)
         
+        # 終値ベースの共通指標（SMA・ボリンジャー・RSI・MACD）を一括計算
+        indicator_cols = dict(_common_indicators(df['Close']))
+
         # ストキャスティクス
-        stoch_indicator = StochasticOscillator(high=df['High'], low=df['Low'], close=df['Close'], window=14, smooth_window=3)
-        df['Stoch_k'] = stoch_indicator.stoch()
-        df['Stoch_d'] = stoch_indicator.stoch_signal()
-        
+        indicator_cols['Stoch_k'], indicator_cols['Stoch_d'] = \
+            _stochastic(df['High'], df['Low'], df['Close'], window=14, smooth_window=3)
+
         # 出来高分析
-        df['Volume_SMA'] = SMAIndicator(close=df['Volume'], window=20).sma_indicator()
-        df['Volume_ratio'] = df['Volume'] / df['Volume_SMA']
+        volume_sma = _sma(df['Volume'], 20)
+        indicator_cols['Volume_SMA'] = volume_sma
+        indicator_cols['Volume_ratio'] = df['Volume'] / volume_sma
+
+        # 指標列は1回のconcatでまとめて結合する
+        # （列を1本ずつ挿入するとBlockManagerが断片化し、以降の行アクセスが遅くなる）
+        df = pd.concat([df, pd.DataFrame(indicator_cols, index=df.index)], axis=1)
+
+        # 日付文字列は1回だけ整形し、クロス検出とチャートデータで共有する
+        date_strs = df.index.strftime('%Y-%m-%d')
+
+        # ゴールデンクロス検出
+        golden_crosses = self._detect_golden_cross(df, date_strs)
+        
+        # 最新値・前日値は配列末尾から一度だけ取り出し、各シグナル分析で共有する
+        signal_cols = ('Close', 'RSI', 'SMA_5', 'SMA_25', 'BB_upper', 'BB_lower',
+                       'BB_squeeze', 'MACD', 'MACD_signal', 'MACD_histogram',
+                       'Stoch_k', 'Stoch_d', 'Volume_ratio')
+        n = len(df)
+        latest = {}
+        prev = {}
+        for col in signal_cols:
+            arr = df[col].to_numpy(dtype=np.float64)
+            latest[col] = self._safe_float(arr[-1]) if n else 0.0
+            prev[col] = self._safe_float(arr[-2]) if n >= 2 else 0.0
         
         # 高度なシグナル分析
-        bollinger_signals = self._analyze_bollinger_signals(df)
-        macd_signals = self._analyze_macd_signals(df)
-        volume_signals = self._analyze_volume_signals(df)
-        stoch_signals = self._analyze_stoch_signals(df)
+        bollinger_signals = self._analyze_bollinger_signals(latest, n)
+        macd_signals = self._analyze_macd_signals(latest, prev, n)
+        volume_signals = self._analyze_volume_signals(latest, n)
+        stoch_signals = self._analyze_stoch_signals(latest, prev, n)
         
         # シグナル生成
-        signals_result = self._generate_signals(df, golden_crosses)
+        signals_result = self._generate_signals(df, golden_crosses, latest)
         
         # 結果を返す（NaN値を処理）
         result = {
-            'chart_data': self._prepare_chart_data(df),
+            'chart_data': self._prepare_chart_data(df, date_strs),
             'golden_crosses': golden_crosses,
-            'latest_rsi': self._safe_float(df['RSI'].iloc[-1]),
+            'latest_rsi': latest['RSI'],
             'signals': signals_result,
             'bollinger_data': {
                 'upper': self._safe_list(df['BB_upper']),
@@ -77,116 +339,126 @@ class TechnicalAnalyzer:
                 'signals': stoch_signals
             },
             'volume_data': {
-                'volume': [int(x) if pd.notna(x) else 0 for x in df['Volume']],
+                'volume': self._safe_int_list(df['Volume']),
                 'volume_sma': self._safe_list(df['Volume_SMA']),
                 'volume_ratio': self._safe_list(df['Volume_ratio']),
                 'signals': volume_signals
             }
         }
         
-        # signals オブジェクトを拡張してフロントエンド互換性を確保
-        if isinstance(signals_result, dict):
-            # signals オブジェクトに個別フィールドを追加
-            result['signals'] = {
-                'rsi_signal': signals_result.get('rsi_signal', 'neutral'),
-                'ma_signal': signals_result.get('ma_signal', 'neutral'),
-                'golden_cross': signals_result.get('golden_cross', False),
-                'list': signals_result.get('list', [])  # 後方互換性
-            }
-            # ルートレベルでも設定（下位互換性）
-            result['rsi_signal'] = signals_result.get('rsi_signal', 'neutral')
-            result['ma_signal'] = signals_result.get('ma_signal', 'neutral') 
-            result['golden_cross'] = signals_result.get('golden_cross', False)
-        
+        # _generate_signalsが返す辞書をそのまま使い、ルートレベルにも複製する（下位互換性）
+        result['rsi_signal'] = signals_result['rsi_signal']
+        result['ma_signal'] = signals_result['ma_signal']
+        result['golden_cross'] = signals_result['golden_cross']
+
         return result
     
+    def analyze_batch(self, stock_data_list, max_workers=None):
+        """
+        複数銘柄の分析をプロセス並列で実行し、入力順のリストで返す
+        各銘柄の分析は独立なのでコア数にほぼ比例してスケールする
+        （失敗した銘柄は{'error': ...}に置き換わる）
+        """
+        import os
+        from concurrent.futures import ProcessPoolExecutor
+
+        if max_workers is None:
+            max_workers = os.cpu_count()
+
+        if len(stock_data_list) <= 1 or max_workers == 1:
+            return [_analyze_job(d) for d in stock_data_list]
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_analyze_job, stock_data_list))
+
     def _safe_float(self, value):
-        """NaN値を安全な値に変換"""
-        if pd.isna(value) or np.isnan(value):
+        """NaN値を安全な値に変換（NaN判定は自己比較で行い、pandasのディスパッチを通さない）"""
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
             return 0.0
-        return float(value)
+        return 0.0 if value != value else value
+    
+    def _safe_int_list(self, series):
+        """NaN値を0に置き換えた整数リストに変換（出来高列の一括変換用）"""
+        arr = np.nan_to_num(np.asarray(series, dtype=np.float64), nan=0.0)
+        return arr.astype(np.int64).tolist()
     
     def _safe_list(self, series):
-        """NaN値を含むSeriesを安全なリストに変換"""
-        return [self._safe_float(x) if pd.notna(x) else None for x in series]
+        """NaN値を含むSeriesを安全なリストに変換（一括tolistしNaN位置だけNoneへ差し替え）"""
+        arr = np.asarray(series, dtype=np.float64)
+        result = arr.tolist()
+        for i in np.flatnonzero(np.isnan(arr)):
+            result[i] = None
+        return result
     
-    def _detect_golden_cross(self, df):
-        """ゴールデンクロス・デッドクロスを検出"""
-        crosses = []
-        
-        # 短期線が長期線を上抜け（ゴールデンクロス）
-        for i in range(1, len(df)):
-            if pd.notna(df['SMA_25'].iloc[i]) and pd.notna(df['SMA_75'].iloc[i]):
-                if (df['SMA_25'].iloc[i-1] <= df['SMA_75'].iloc[i-1] and 
-                    df['SMA_25'].iloc[i] > df['SMA_75'].iloc[i]):
-                    crosses.append({
-                        'date': df.index[i].strftime('%Y-%m-%d'),
-                        'type': 'golden',
-                        'price': self._safe_float(df['Close'].iloc[i])
-                    })
-                elif (df['SMA_25'].iloc[i-1] >= df['SMA_75'].iloc[i-1] and 
-                      df['SMA_25'].iloc[i] < df['SMA_75'].iloc[i]):
-                    crosses.append({
-                        'date': df.index[i].strftime('%Y-%m-%d'),
-                        'type': 'dead',
-                        'price': self._safe_float(df['Close'].iloc[i])
-                    })
-        
-        return crosses
+    def _detect_golden_cross(self, df, date_strs):
+        """ゴールデンクロス・デッドクロスを検出（前日比較を配列シフトで一括判定）"""
+        s25 = df['SMA_25'].to_numpy(dtype=np.float64)
+        s75 = df['SMA_75'].to_numpy(dtype=np.float64)
+        if len(s25) < 2:
+            return []
+
+        # 短期線と長期線の差の符号反転でクロスを検出
+        # （NaNを含む比較はFalseになるため、計算不能期間は自然と除外される）
+        diff = s25 - s75
+        golden = (diff[:-1] <= 0) & (diff[1:] > 0)
+        dead = (diff[:-1] >= 0) & (diff[1:] < 0)
+
+        cross_idx = np.flatnonzero(golden | dead) + 1
+        if cross_idx.size == 0:
+            return []
+
+        # 終値はクロス発生行だけ取り出す（日付文字列は呼び出し側で整形済み）
+        closes = df['Close'].to_numpy(dtype=np.float64)
+        return [
+            {
+                'date': date_strs[i],
+                'type': 'golden' if golden[i - 1] else 'dead',
+                'price': self._safe_float(closes[i]),
+                'idx': int(i)  # 経過日数計算用の行番号（日付文字列の再パースを避ける）
+            }
+            for i in cross_idx
+        ]
     
-    def _prepare_chart_data(self, df):
-        """Plotly用のチャートデータを準備"""
+    def _prepare_chart_data(self, df, date_strs):
+        """Plotly用のチャートデータを準備（日付文字列は呼び出し側で整形済み）"""
         return {
-            'dates': df.index.strftime('%Y-%m-%d').tolist(),
+            'dates': date_strs.tolist(),
             'prices': self._safe_list(df['Close']),
             'sma_5': self._safe_list(df['SMA_5']),
             'sma_25': self._safe_list(df['SMA_25']),
             'sma_75': self._safe_list(df['SMA_75']),
-            'volume': [int(x) if pd.notna(x) else 0 for x in df['Volume']]
+            'volume': self._safe_int_list(df['Volume'])
         }
     
-    def _generate_signals(self, df, golden_crosses):
-        """売買シグナルを生成"""
-        print(f"=== Signal Generation Debug ===")
-        print(f"DataFrame length: {len(df)}")
-        
-        # ログファイルにも出力
-        import logging
-        logging.basicConfig(level=logging.INFO)
-        logger = logging.getLogger(__name__)
-        logger.info(f"=== Signal Generation Debug ===")
-        logger.info(f"DataFrame length: {len(df)}")
+    def _generate_signals(self, df, golden_crosses, latest):
+        """売買シグナルを生成（最新値はanalyzeで一括取得済み）"""
         # 最新のRSI
-        latest_rsi = self._safe_float(df['RSI'].iloc[-1])
-        print(f"Latest RSI: {latest_rsi}")
+        latest_rsi = latest['RSI']
         rsi_signal = 'neutral'
         if latest_rsi > 0:  # RSIが計算できている場合のみ
             if latest_rsi < 35:  # 閾値を30→35に調整
                 rsi_signal = 'buy'
-                print(f"RSI Buy signal triggered: {latest_rsi}")
             elif latest_rsi > 65:  # 閾値を70→65に調整
                 rsi_signal = 'sell'
-                print(f"RSI Sell signal triggered: {latest_rsi}")
-            else:
-                print(f"RSI Neutral: {latest_rsi} (not < 35 or > 65)")
         
         # 移動平均シグナル
         ma_signal = 'neutral'
         if len(df) >= 25:  # 25日移動平均が計算できる場合
-            latest_sma5 = self._safe_float(df['SMA_5'].iloc[-1])
-            latest_sma25 = self._safe_float(df['SMA_25'].iloc[-1])
-            print(f"SMA5: {latest_sma5}, SMA25: {latest_sma25}")
+            latest_sma5 = latest['SMA_5']
+            latest_sma25 = latest['SMA_25']
             
             if latest_sma5 > 0 and latest_sma25 > 0:
                 if latest_sma5 > latest_sma25:
                     # 5日線が25日線を上回っている
                     # さらに価格も確認
-                    latest_price = self._safe_float(df['Close'].iloc[-1])
+                    latest_price = latest['Close']
                     if latest_price > latest_sma5:
                         ma_signal = 'buy'
                 elif latest_sma5 < latest_sma25:
                     # 5日線が25日線を下回っている
-                    latest_price = self._safe_float(df['Close'].iloc[-1])
+                    latest_price = latest['Close']
                     if latest_price < latest_sma5:
                         ma_signal = 'sell'
         
@@ -194,7 +466,8 @@ class TechnicalAnalyzer:
         golden_cross = False
         if golden_crosses:
             latest_cross = golden_crosses[-1]
-            days_ago = (pd.Timestamp.now() - pd.to_datetime(latest_cross['date'])).days
+            # 日付文字列を再パースせず、元のTimestampを行番号で引く
+            days_ago = (pd.Timestamp.now() - df.index[latest_cross['idx']]).days
             if days_ago <= 5 and latest_cross['type'] == 'golden':
                 golden_cross = True
         
@@ -220,20 +493,21 @@ class TechnicalAnalyzer:
             'golden_cross': golden_cross,
             'list': signal_list  # 後方互換性
         }
-        print(f"Final signals: {result}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Signals for %d rows: %s", len(df), result)
         return result
     
-    def _analyze_bollinger_signals(self, df):
-        """ボリンジャーバンドシグナル分析"""
+    def _analyze_bollinger_signals(self, latest, n):
+        """ボリンジャーバンドシグナル分析（最新値はanalyzeで一括取得済み）"""
         signals = []
         
-        if len(df) < 20:
+        if n < 20:
             return signals
             
-        latest_close = self._safe_float(df['Close'].iloc[-1])
-        latest_upper = self._safe_float(df['BB_upper'].iloc[-1])
-        latest_lower = self._safe_float(df['BB_lower'].iloc[-1])
-        latest_squeeze = self._safe_float(df['BB_squeeze'].iloc[-1])
+        latest_close = latest['Close']
+        latest_upper = latest['BB_upper']
+        latest_lower = latest['BB_lower']
+        latest_squeeze = latest['BB_squeeze']
         
         if latest_close > 0 and latest_upper > 0 and latest_lower > 0:
             # バンドウォーク
@@ -248,19 +522,19 @@ class TechnicalAnalyzer:
         
         return signals
     
-    def _analyze_macd_signals(self, df):
-        """MACDシグナル分析"""
+    def _analyze_macd_signals(self, latest, prev, n):
+        """MACDシグナル分析（最新値・前日値はanalyzeで一括取得済み）"""
         signals = []
         
-        if len(df) < 26:
+        if n < 26:
             return signals
             
-        latest_macd = self._safe_float(df['MACD'].iloc[-1])
-        latest_signal = self._safe_float(df['MACD_signal'].iloc[-1])
-        latest_histogram = self._safe_float(df['MACD_histogram'].iloc[-1])
+        latest_macd = latest['MACD']
+        latest_signal = latest['MACD_signal']
+        latest_histogram = latest['MACD_histogram']
         
-        if len(df) >= 2:
-            prev_histogram = self._safe_float(df['MACD_histogram'].iloc[-2])
+        if n >= 2:
+            prev_histogram = prev['MACD_histogram']
             
             # ゴールデンクロス・デッドクロス
             if latest_macd > latest_signal and prev_histogram <= 0 and latest_histogram > 0:
@@ -276,14 +550,14 @@ class TechnicalAnalyzer:
         
         return signals
     
-    def _analyze_volume_signals(self, df):
-        """出来高シグナル分析"""
+    def _analyze_volume_signals(self, latest, n):
+        """出来高シグナル分析（最新値はanalyzeで一括取得済み）"""
         signals = []
         
-        if len(df) < 20:
+        if n < 20:
             return signals
             
-        latest_ratio = self._safe_float(df['Volume_ratio'].iloc[-1])
+        latest_ratio = latest['Volume_ratio']
         
         if latest_ratio > 0:
             if latest_ratio >= 2.0:
@@ -295,15 +569,15 @@ class TechnicalAnalyzer:
         
         return signals
     
-    def _analyze_stoch_signals(self, df):
-        """ストキャスティクスシグナル分析"""
+    def _analyze_stoch_signals(self, latest, prev, n):
+        """ストキャスティクスシグナル分析（最新値・前日値はanalyzeで一括取得済み）"""
         signals = []
         
-        if len(df) < 14:
+        if n < 14:
             return signals
             
-        latest_k = self._safe_float(df['Stoch_k'].iloc[-1])
-        latest_d = self._safe_float(df['Stoch_d'].iloc[-1])
+        latest_k = latest['Stoch_k']
+        latest_d = latest['Stoch_d']
         
         if latest_k > 0 and latest_d > 0:
             # 買われすぎ・売られすぎ
@@ -313,9 +587,9 @@ class TechnicalAnalyzer:
                 signals.append({'type': 'buy', 'reason': 'ストキャスティクス売られすぎ', 'strength': 'medium'})
             
             # ゴールデンクロス・デッドクロス
-            if len(df) >= 2:
-                prev_k = self._safe_float(df['Stoch_k'].iloc[-2])
-                prev_d = self._safe_float(df['Stoch_d'].iloc[-2])
+            if n >= 2:
+                prev_k = prev['Stoch_k']
+                prev_d = prev['Stoch_d']
                 
                 if prev_k <= prev_d and latest_k > latest_d and latest_k < 50:
                     signals.append({'type': 'buy', 'reason': 'ストキャスティクスゴールデンクロス', 'strength': 'medium'})
@@ -328,179 +602,155 @@ class TechnicalAnalyzer:
         """
         スイング投資用の6ヶ月間テクニカル指標を計算
         """
-        df = stock_data.copy()
-        
-        # 移動平均線 (5日、25日、75日)
-        df['SMA_5'] = SMAIndicator(close=df['Close'], window=5).sma_indicator()
-        df['SMA_25'] = SMAIndicator(close=df['Close'], window=25).sma_indicator()
-        df['SMA_75'] = SMAIndicator(close=df['Close'], window=75).sma_indicator()
-        
-        # ボリンジャーバンド (20日、±2σ)
-        bb = BollingerBands(close=df['Close'], window=20, window_dev=2)
-        df['BB_upper'] = bb.bollinger_hband()
-        df['BB_middle'] = bb.bollinger_mavg()
-        df['BB_lower'] = bb.bollinger_lband()
-        df['BB_squeeze'] = bb.bollinger_wband()
-        
-        # RSI (14日)
-        df['RSI'] = RSIIndicator(close=df['Close'], window=14).rsi()
-        
-        # MACD (12,26,9)
-        macd = MACD(close=df['Close'], window_fast=12, window_slow=26, window_sign=9)
-        df['MACD'] = macd.macd()
-        df['MACD_signal'] = macd.macd_signal()
-        df['MACD_histogram'] = macd.macd_diff()
-        
+        # 入力DataFrameは読み取りのみなのでコピーせず、共通指標はメモ化計算を使う
+        volume = stock_data['Volume']
+        ind = _common_indicators(stock_data['Close'])
+
         # 出来高の移動平均 (出来高1.5倍以上の検出用)
-        df['Volume_MA'] = df['Volume'].rolling(window=20).mean()
-        df['Volume_ratio'] = df['Volume'] / df['Volume_MA']
-        
+        volume_ma = _sma(volume, 20)
+        volume_ratio = volume / volume_ma
+
         return {
-            'ma_5': self._safe_list(df['SMA_5']),
-            'ma_25': self._safe_list(df['SMA_25']),
-            'ma_75': self._safe_list(df['SMA_75']),
-            'bb_upper': self._safe_list(df['BB_upper']),
-            'bb_middle': self._safe_list(df['BB_middle']),
-            'bb_lower': self._safe_list(df['BB_lower']),
-            'bb_squeeze': self._safe_list(df['BB_squeeze']),
-            'rsi': self._safe_list(df['RSI']),
-            'macd': self._safe_list(df['MACD']),
-            'macd_signal': self._safe_list(df['MACD_signal']),
-            'macd_histogram': self._safe_list(df['MACD_histogram']),
-            'volume_ratio': self._safe_list(df['Volume_ratio'])
+            'ma_5': self._safe_list(ind['SMA_5']),
+            'ma_25': self._safe_list(ind['SMA_25']),
+            'ma_75': self._safe_list(ind['SMA_75']),
+            'bb_upper': self._safe_list(ind['BB_upper']),
+            'bb_middle': self._safe_list(ind['BB_middle']),
+            'bb_lower': self._safe_list(ind['BB_lower']),
+            'bb_squeeze': self._safe_list(ind['BB_squeeze']),
+            'rsi': self._safe_list(ind['RSI']),
+            'macd': self._safe_list(ind['MACD']),
+            'macd_signal': self._safe_list(ind['MACD_signal']),
+            'macd_histogram': self._safe_list(ind['MACD_histogram']),
+            'volume_ratio': self._safe_list(volume_ratio)
         }
     
     def calculate_atr(self, stock_data, period=14):
         """
-        ATR (Average True Range) を計算
+        ATR (Average True Range) を計算（中間列を作らず1パスのufuncでTRを算出）
         """
-        df = stock_data.copy()
-        
-        # True Rangeを計算
-        df['prev_close'] = df['Close'].shift(1)
-        df['tr1'] = df['High'] - df['Low']
-        df['tr2'] = abs(df['High'] - df['prev_close'])
-        df['tr3'] = abs(df['Low'] - df['prev_close'])
-        df['TR'] = df[['tr1', 'tr2', 'tr3']].max(axis=1)
-        
-        # ATRを計算
-        df['ATR'] = df['TR'].rolling(window=period).mean()
-        
-        return self._safe_list(df['ATR'])
+        high = stock_data['High'].to_numpy(dtype=np.float64)
+        low = stock_data['Low'].to_numpy(dtype=np.float64)
+        close = stock_data['Close'].to_numpy(dtype=np.float64)
+        if close.size == 0:
+            return []
+
+        prev_close = np.empty_like(close)
+        prev_close[0] = np.nan
+        prev_close[1:] = close[:-1]
+
+        # fmaxはNaNを無視するため、初日（前日終値なし）はhigh-lowがそのままTRになる
+        tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        atr = pd.Series(tr).rolling(window=period).mean()
+        return self._safe_list(atr)
     
     def detect_swing_signals(self, stock_data, indicators):
         """
         スイング投資用の買い/売りシグナルを検出
         """
-        df = stock_data.copy()
-        signals = {
-            'buy_signals': [],
-            'sell_signals': [],
-            'golden_cross': [],
-            'dead_cross': [],
-            'bb_squeeze_break': []
-        }
-        
+        df = stock_data
+        # 日付・終値は一括変換し、シグナル発生行だけ辞書化する
+        # （None→NaN変換後の比較はFalseになるため、計算不能期間は自然と除外される）
+        dates = df.index.strftime('%Y-%m-%d')
+        closes = df['Close'].to_numpy(dtype=np.float64)
+
+        def to_arr(values):
+            return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
         # RSIによるシグナル検出
-        for i, rsi in enumerate(indicators['rsi']):
-            if rsi is not None and rsi <= 30:
-                signals['buy_signals'].append({
-                    'date': df.index[i].strftime('%Y-%m-%d'),
-                    'price': float(df['Close'].iloc[i]),
-                    'type': 'RSI',
-                    'reason': f'RSI: {rsi:.1f}',
-                    'marker': 'triangle-up',
-                    'color': 'green'
-                })
-            elif rsi is not None and rsi >= 70:
-                signals['sell_signals'].append({
-                    'date': df.index[i].strftime('%Y-%m-%d'),
-                    'price': float(df['Close'].iloc[i]),
-                    'type': 'RSI',
-                    'reason': f'RSI: {rsi:.1f}',
-                    'marker': 'triangle-down',
-                    'color': 'red'
-                })
-        
-        # ゴールデンクロス/デッドクロス検出
-        for i in range(1, len(indicators['ma_25'])):
-            ma25_prev = indicators['ma_25'][i-1]
-            ma25_curr = indicators['ma_25'][i]
-            ma75_prev = indicators['ma_75'][i-1]
-            ma75_curr = indicators['ma_75'][i]
-            
-            if (ma25_prev is not None and ma75_prev is not None and 
-                ma25_curr is not None and ma75_curr is not None):
-                
-                # ゴールデンクロス
-                if ma25_prev <= ma75_prev and ma25_curr > ma75_curr:
-                    signals['golden_cross'].append({
-                        'date': df.index[i].strftime('%Y-%m-%d'),
-                        'price': float(df['Close'].iloc[i]),
-                        'type': 'Golden Cross',
-                        'reason': '25日線が75日線を上抜け',
-                        'marker': 'triangle-up',
-                        'color': 'gold'
-                    })
-                
-                # デッドクロス
-                elif ma25_prev >= ma75_prev and ma25_curr < ma75_curr:
-                    signals['dead_cross'].append({
-                        'date': df.index[i].strftime('%Y-%m-%d'),
-                        'price': float(df['Close'].iloc[i]),
-                        'type': 'Dead Cross',
-                        'reason': '25日線が75日線を下抜け',
-                        'marker': 'triangle-down',
-                        'color': 'orange'
-                    })
-        
+        rsi = to_arr(indicators['rsi'])
+        buy_signals = [
+            {
+                'date': dates[i],
+                'price': float(closes[i]),
+                'type': 'RSI',
+                'reason': f'RSI: {rsi[i]:.1f}',
+                'marker': 'triangle-up',
+                'color': 'green'
+            }
+            for i in np.flatnonzero(rsi <= 30)
+        ]
+        sell_signals = [
+            {
+                'date': dates[i],
+                'price': float(closes[i]),
+                'type': 'RSI',
+                'reason': f'RSI: {rsi[i]:.1f}',
+                'marker': 'triangle-down',
+                'color': 'red'
+            }
+            for i in np.flatnonzero(rsi >= 70)
+        ]
+
+        # ゴールデンクロス/デッドクロス検出（前日比較を配列シフトで一括判定）
+        ma25 = to_arr(indicators['ma_25'])
+        ma75 = to_arr(indicators['ma_75'])
+        golden_mask = (ma25[:-1] <= ma75[:-1]) & (ma25[1:] > ma75[1:])
+        dead_mask = (ma25[:-1] >= ma75[:-1]) & (ma25[1:] < ma75[1:])
+        golden_cross = [
+            {
+                'date': dates[i],
+                'price': float(closes[i]),
+                'type': 'Golden Cross',
+                'reason': '25日線が75日線を上抜け',
+                'marker': 'triangle-up',
+                'color': 'gold'
+            }
+            for i in np.flatnonzero(golden_mask) + 1
+        ]
+        dead_cross = [
+            {
+                'date': dates[i],
+                'price': float(closes[i]),
+                'type': 'Dead Cross',
+                'reason': '25日線が75日線を下抜け',
+                'marker': 'triangle-down',
+                'color': 'orange'
+            }
+            for i in np.flatnonzero(dead_mask) + 1
+        ]
+
         # ボリンジャーバンドスクイーズブレイク検出
-        for i in range(1, len(indicators['bb_squeeze'])):
-            squeeze_prev = indicators['bb_squeeze'][i-1]
-            squeeze_curr = indicators['bb_squeeze'][i]
-            
-            if (squeeze_prev is not None and squeeze_curr is not None and
-                squeeze_prev < 0.1 and squeeze_curr > 0.15):  # スクイーズからブレイク
-                signals['bb_squeeze_break'].append({
-                    'date': df.index[i].strftime('%Y-%m-%d'),
-                    'price': float(df['Close'].iloc[i]),
-                    'type': 'BB Squeeze Break',
-                    'reason': 'ボリンジャーバンド拡張開始',
-                    'marker': 'diamond',
-                    'color': 'purple'
-                })
-        
-        return signals
+        squeeze = to_arr(indicators['bb_squeeze'])
+        break_mask = (squeeze[:-1] < 0.1) & (squeeze[1:] > 0.15)  # スクイーズからブレイク
+        bb_squeeze_break = [
+            {
+                'date': dates[i],
+                'price': float(closes[i]),
+                'type': 'BB Squeeze Break',
+                'reason': 'ボリンジャーバンド拡張開始',
+                'marker': 'diamond',
+                'color': 'purple'
+            }
+            for i in np.flatnonzero(break_mask) + 1
+        ]
+
+        return {
+            'buy_signals': buy_signals,
+            'sell_signals': sell_signals,
+            'golden_cross': golden_cross,
+            'dead_cross': dead_cross,
+            'bb_squeeze_break': bb_squeeze_break
+        }
     
     def calculate_swing_score(self, stock_data):
         """
         スイング投資スコア（100点満点）を計算
         評価項目：トレンド、モメンタム、ボラティリティ、出来高、サポート/レジスタンス
         """
-        df = pd.DataFrame(stock_data['prices'])
-        df['Date'] = pd.to_datetime(stock_data['dates'])
-        df.set_index('Date', inplace=True)
-        
-        # テクニカル指標を計算
-        df['SMA_5'] = SMAIndicator(close=df['Close'], window=5).sma_indicator()
-        df['SMA_25'] = SMAIndicator(close=df['Close'], window=25).sma_indicator()
-        df['SMA_75'] = SMAIndicator(close=df['Close'], window=75).sma_indicator()
-        
-        df['RSI'] = RSIIndicator(close=df['Close'], window=14).rsi()
-        
-        macd = MACD(close=df['Close'], window_fast=12, window_slow=26, window_sign=9)
-        df['MACD'] = macd.macd()
-        df['MACD_signal'] = macd.macd_signal()
-        
-        bb = BollingerBands(close=df['Close'], window=20, window_dev=2)
-        df['BB_upper'] = bb.bollinger_hband()
-        df['BB_middle'] = bb.bollinger_mavg()
-        df['BB_lower'] = bb.bollinger_lband()
+        df = _price_frame(stock_data)
         
+        # テクニカル指標を計算（共通指標はメモ化計算を使い、列は1回のconcatで結合）
+        indicators = _common_indicators(df['Close'])
+        indicator_cols = {col: indicators[col]
+                          for col in ('SMA_5', 'SMA_25', 'SMA_75', 'RSI', 'MACD', 'MACD_signal',
+                                      'BB_upper', 'BB_middle', 'BB_lower')}
+
         atr = AverageTrueRange(high=df['High'], low=df['Low'], close=df['Close'], window=14)
-        df['ATR'] = atr.average_true_range()
-        
-        df['Volume_SMA'] = SMAIndicator(close=df['Volume'], window=20).sma_indicator()
+        indicator_cols['ATR'] = atr.average_true_range()
+
+        indicator_cols['Volume_SMA'] = _sma(df['Volume'], 20)
+        df = pd.concat([df, pd.DataFrame(indicator_cols, index=df.index)], axis=1)
         
         # 現在の値を取得
         current_price = df['Close'].iloc[-1]
@@ -686,14 +936,15 @@ class TechnicalAnalyzer:
             score += 2   # 出来高減少
         
         # 出来高トレンド (10点)
-        recent_volumes = df['Volume'].tail(5)
-        older_volumes = df['Volume'].tail(20).head(15)
-        
-        if recent_volumes.mean() > older_volumes.mean() * 1.2:
+        volumes = df['Volume'].to_numpy(dtype=np.float64)
+        recent_mean = volumes[-5:].mean()
+        older_mean = volumes[-20:][:15].mean()
+
+        if recent_mean > older_mean * 1.2:
             score += 8   # 出来高増加トレンド
-        elif recent_volumes.mean() > older_volumes.mean():
+        elif recent_mean > older_mean:
             score += 6   # やや増加傾向
-        elif recent_volumes.mean() > older_volumes.mean() * 0.8:
+        elif recent_mean > older_mean * 0.8:
             score += 4   # 安定
         else:
             score += 2   # 出来高減少傾向
@@ -703,11 +954,12 @@ class TechnicalAnalyzer:
     def _calculate_support_resistance_score(self, price, df):
         """サポート/レジスタンス評価スコア (20点満点)"""
         score = 0
-        
-        # 過去20日の高値・安値
-        high_20 = df['High'].tail(20).max()
-        low_20 = df['Low'].tail(20).min()
-        
+
+        # 過去20日の高値・安値（末尾スライスした配列上で一括計算）
+        lows = df['Low'].to_numpy(dtype=np.float64)[-20:]
+        high_20 = df['High'].to_numpy(dtype=np.float64)[-20:].max()
+        low_20 = lows.min()
+
         # 価格位置評価 (10点)
         price_position = (price - low_20) / (high_20 - low_20) * 100
         if 30 <= price_position <= 70:
@@ -722,8 +974,7 @@ class TechnicalAnalyzer:
             score += 2   # 高値圏（利確検討）
         
         # サポートライン強度 (10点)
-        recent_lows = df['Low'].tail(20)
-        support_touches = sum(abs(low - price) / price < 0.02 for low in recent_lows)
+        support_touches = int(np.count_nonzero(np.abs(lows - price) / price < 0.02))
         
         if support_touches >= 3:
             score += 8   # 強いサポート
@@ -2,7 +2,7 @@ from flask import Flask, render_template, jsonify, request
 from analyzers.data_fetcher import StockDataFetcher
 from analyzers.technical import TechnicalAnalyzer
 from analyzers.fundamental import FundamentalAnalyzer
-from analyzers.backtester import BacktestEngine
+from analyzers.backtester import BacktestEngine, trades_to_dicts
 from analyzers.strategies import StrategyManager
 from analyzers.performance import PerformanceAnalyzer
 from utils.database import db_manager
@@ -177,6 +177,9 @@ def backtest():
             strategy_params=strategy_params_with_name
         )
         print(f"[BACKTEST] バックテスト完了: {len(backtest_result['trades'])}回の取引")
+
+        # JSON/DB向けにはlist[dict]へ変換（計算は構造化配列のまま行う）
+        trades_list = trades_to_dicts(backtest_result['trades'])
         
         # パフォーマンス分析
         print(f"[BACKTEST] パフォーマンス分析開始")
@@ -210,16 +213,16 @@ def backtest():
                     'exit_reason': str(trade['exit_reason']),
                     'holding_days': int(trade['holding_days'])
                 }
-                for trade in backtest_result['trades'][:50]
+                for trade in trades_list[:50]
             ],
             'chart_data': {
                 'dates': backtest_result['price_data'].index.strftime('%Y-%m-%d').tolist(),
                 'prices': [float(x) for x in backtest_result['price_data']['Close'].tolist()],
                 'signals': {
-                    'buy_dates': [trade['entry_date'].strftime('%Y-%m-%d') for trade in backtest_result['trades']],
-                    'sell_dates': [trade['exit_date'].strftime('%Y-%m-%d') for trade in backtest_result['trades']],
-                    'buy_prices': [float(trade['entry_price']) for trade in backtest_result['trades']],
-                    'sell_prices': [float(trade['exit_price']) for trade in backtest_result['trades']]
+                    'buy_dates': [trade['entry_date'].strftime('%Y-%m-%d') for trade in trades_list],
+                    'sell_dates': [trade['exit_date'].strftime('%Y-%m-%d') for trade in trades_list],
+                    'buy_prices': [trade['entry_price'] for trade in trades_list],
+                    'sell_prices': [trade['exit_price'] for trade in trades_list]
                 }
             },
             'strategy_info': {
@@ -239,7 +242,7 @@ def backtest():
                 end_date=end_date,
                 initial_capital=initial_capital,
                 performance_metrics=performance_metrics,
-                trades_data=backtest_result['trades'],
+                trades_data=trades_list,
                 strategy_params=strategy.get_params()
             )
             logger.info(f"Backtest results auto-saved for {clean_ticker} using {strategy_id} strategy")